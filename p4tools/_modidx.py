@@ -6,20 +6,65 @@ d = { 'settings': { 'branch': 'master',
                 'git_url': 'https://github.com/michaelaye/p4tools',
                 'lib_path': 'p4tools'},
   'syms': { 'p4tools.data_extract': {},
-            'p4tools.io': { 'p4tools.io._get_hash': ('io.html#_get_hash', 'p4tools/io.py'),
+            'p4tools.io': { 'p4tools.io.CatalogCache': ('io.html#catalogcache', 'p4tools/io.py'),
+                            'p4tools.io.CatalogCache.__contains__': ('io.html#catalogcache.__contains__', 'p4tools/io.py'),
+                            'p4tools.io.CatalogCache.__init__': ('io.html#catalogcache.__init__', 'p4tools/io.py'),
+                            'p4tools.io.CatalogCache.__len__': ('io.html#catalogcache.__len__', 'p4tools/io.py'),
+                            'p4tools.io.CatalogCache.__repr__': ('io.html#catalogcache.__repr__', 'p4tools/io.py'),
+                            'p4tools.io.CatalogCache._sizeof': ('io.html#catalogcache._sizeof', 'p4tools/io.py'),
+                            'p4tools.io.CatalogCache.get': ('io.html#catalogcache.get', 'p4tools/io.py'),
+                            'p4tools.io.CatalogCache.invalidate': ('io.html#catalogcache.invalidate', 'p4tools/io.py'),
+                            'p4tools.io.CatalogCache.nbytes': ('io.html#catalogcache.nbytes', 'p4tools/io.py'),
+                            'p4tools.io.TileImageStore': ('io.html#tileimagestore', 'p4tools/io.py'),
+                            'p4tools.io.TileImageStore.__contains__': ('io.html#tileimagestore.__contains__', 'p4tools/io.py'),
+                            'p4tools.io.TileImageStore.__init__': ('io.html#tileimagestore.__init__', 'p4tools/io.py'),
+                            'p4tools.io.TileImageStore._load': ('io.html#tileimagestore._load', 'p4tools/io.py'),
+                            'p4tools.io.TileImageStore.file_for': ('io.html#tileimagestore.file_for', 'p4tools/io.py'),
+                            'p4tools.io.TileImageStore.get': ('io.html#tileimagestore.get', 'p4tools/io.py'),
+                            'p4tools.io.TileImageStore.invalidate': ('io.html#tileimagestore.invalidate', 'p4tools/io.py'),
+                            'p4tools.io.TileImageStore.path': ('io.html#tileimagestore.path', 'p4tools/io.py'),
+                            'p4tools.io.TileImageStore.put': ('io.html#tileimagestore.put', 'p4tools/io.py'),
+                            'p4tools.io.TileIndex': ('io.html#tileindex', 'p4tools/io.py'),
+                            'p4tools.io.TileIndex.__contains__': ('io.html#tileindex.__contains__', 'p4tools/io.py'),
+                            'p4tools.io.TileIndex.__init__': ('io.html#tileindex.__init__', 'p4tools/io.py'),
+                            'p4tools.io.TileIndex.__len__': ('io.html#tileindex.__len__', 'p4tools/io.py'),
+                            'p4tools.io.TileIndex.get': ('io.html#tileindex.get', 'p4tools/io.py'),
+                            'p4tools.io.TileIndex.get_many': ('io.html#tileindex.get_many', 'p4tools/io.py'),
+                            'p4tools.io.TileIndex.nbytes': ('io.html#tileindex.nbytes', 'p4tools/io.py'),
+                            'p4tools.io.TileIndex.positions': ('io.html#tileindex.positions', 'p4tools/io.py'),
+                            'p4tools.io.TileIndex.tile_ids': ('io.html#tileindex.tile_ids', 'p4tools/io.py'),
+                            'p4tools.io._apply_filters': ('io.html#_apply_filters', 'p4tools/io.py'),
+                            'p4tools.io._build_filters': ('io.html#_build_filters', 'p4tools/io.py'),
+                            'p4tools.io._cached': ('io.html#_cached', 'p4tools/io.py'),
+                            'p4tools.io._get_hash': ('io.html#_get_hash', 'p4tools/io.py'),
+                            'p4tools.io._load_catalog': ('io.html#_load_catalog', 'p4tools/io.py'),
+                            'p4tools.io._optimize_dtypes': ('io.html#_optimize_dtypes', 'p4tools/io.py'),
+                            'p4tools.io._read_catalog': ('io.html#_read_catalog', 'p4tools/io.py'),
+                            'p4tools.io._read_columnar': ('io.html#_read_columnar', 'p4tools/io.py'),
+                            'p4tools.io._retrieve_subframe': ('io.html#_retrieve_subframe', 'p4tools/io.py'),
+                            'p4tools.io._retrieve_with_retries': ('io.html#_retrieve_with_retries', 'p4tools/io.py'),
+                            'p4tools.io._to_uint8': ('io.html#_to_uint8', 'p4tools/io.py'),
+                            'p4tools.io._write_columnar': ('io.html#_write_columnar', 'p4tools/io.py'),
                             'p4tools.io.fetch_zipped_file': ('io.html#fetch_zipped_file', 'p4tools/io.py'),
                             'p4tools.io.get_blotch_catalog': ('io.html#get_blotch_catalog', 'p4tools/io.py'),
                             'p4tools.io.get_blotches_for_tile': ('io.html#get_blotches_for_tile', 'p4tools/io.py'),
+                            'p4tools.io.get_columnar_path': ('io.html#get_columnar_path', 'p4tools/io.py'),
                             'p4tools.io.get_fan_catalog': ('io.html#get_fan_catalog', 'p4tools/io.py'),
                             'p4tools.io.get_fans_for_tile': ('io.html#get_fans_for_tile', 'p4tools/io.py'),
                             'p4tools.io.get_hirise_id_for_tile': ('io.html#get_hirise_id_for_tile', 'p4tools/io.py'),
+                            'p4tools.io.get_markings_for_tiles': ('io.html#get_markings_for_tiles', 'p4tools/io.py'),
                             'p4tools.io.get_meta_data': ('io.html#get_meta_data', 'p4tools/io.py'),
                             'p4tools.io.get_region_names': ('io.html#get_region_names', 'p4tools/io.py'),
                             'p4tools.io.get_subframe': ('io.html#get_subframe', 'p4tools/io.py'),
                             'p4tools.io.get_subframe_by_tile_id': ('io.html#get_subframe_by_tile_id', 'p4tools/io.py'),
                             'p4tools.io.get_tile_coords': ('io.html#get_tile_coords', 'p4tools/io.py'),
+                            'p4tools.io.get_tile_index': ('io.html#get_tile_index', 'p4tools/io.py'),
                             'p4tools.io.get_tile_urls': ('io.html#get_tile_urls', 'p4tools/io.py'),
-                            'p4tools.io.get_url_for_tile_id': ('io.html#get_url_for_tile_id', 'p4tools/io.py')},
+                            'p4tools.io.get_tiles_cache_path': ('io.html#get_tiles_cache_path', 'p4tools/io.py'),
+                            'p4tools.io.get_url_for_tile_id': ('io.html#get_url_for_tile_id', 'p4tools/io.py'),
+                            'p4tools.io.invalidate': ('io.html#invalidate', 'p4tools/io.py'),
+                            'p4tools.io.prefetch_subframes': ('io.html#prefetch_subframes', 'p4tools/io.py'),
+                            'p4tools.io.prefetch_urls': ('io.html#prefetch_urls', 'p4tools/io.py')},
             'p4tools.markings': { 'p4tools.markings.Blotch': ('markings.html#blotch', 'p4tools/markings.py'),
                                   'p4tools.markings.Blotch.__init__': ('markings.html#blotch.__init__', 'p4tools/markings.py'),
                                   'p4tools.markings.Blotch.__repr__': ('markings.html#blotch.__repr__', 'p4tools/markings.py'),
@@ -46,6 +91,22 @@ d = { 'settings': { 'branch': 'master',
                                   'p4tools.markings.Blotch.x2': ('markings.html#blotch.x2', 'p4tools/markings.py'),
                                   'p4tools.markings.Blotch.y1': ('markings.html#blotch.y1', 'p4tools/markings.py'),
                                   'p4tools.markings.Blotch.y2': ('markings.html#blotch.y2', 'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray': ('markings.html#blotcharray', 'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray.__getitem__': ( 'markings.html#blotcharray.__getitem__',
+                                                                                'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray.__init__': ('markings.html#blotcharray.__init__', 'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray.__iter__': ('markings.html#blotcharray.__iter__', 'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray.__len__': ('markings.html#blotcharray.__len__', 'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray.area': ('markings.html#blotcharray.area', 'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray.from_tile_id': ( 'markings.html#blotcharray.from_tile_id',
+                                                                                 'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray.limit_points': ( 'markings.html#blotcharray.limit_points',
+                                                                                 'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray.semi_axis_1': ( 'markings.html#blotcharray.semi_axis_1',
+                                                                                'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray.semi_axis_2': ( 'markings.html#blotcharray.semi_axis_2',
+                                                                                'p4tools/markings.py'),
+                                  'p4tools.markings.BlotchArray.store': ('markings.html#blotcharray.store', 'p4tools/markings.py'),
                                   'p4tools.markings.Fan': ('markings.html#fan', 'p4tools/markings.py'),
                                   'p4tools.markings.Fan.__init__': ('markings.html#fan.__init__', 'p4tools/markings.py'),
                                   'p4tools.markings.Fan.__repr__': ('markings.html#fan.__repr__', 'p4tools/markings.py'),
@@ -72,15 +133,43 @@ d = { 'settings': { 'branch': 'master',
                                   'p4tools.markings.Fan.store': ('markings.html#fan.store', 'p4tools/markings.py'),
                                   'p4tools.markings.Fan.tile_id': ('markings.html#fan.tile_id', 'p4tools/markings.py'),
                                   'p4tools.markings.Fan.to_shapely': ('markings.html#fan.to_shapely', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray': ('markings.html#fanarray', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.__getitem__': ('markings.html#fanarray.__getitem__', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.__init__': ('markings.html#fanarray.__init__', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.__iter__': ('markings.html#fanarray.__iter__', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.__len__': ('markings.html#fanarray.__len__', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.area': ('markings.html#fanarray.area', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.arm1': ('markings.html#fanarray.arm1', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.arm2': ('markings.html#fanarray.arm2', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.center': ('markings.html#fanarray.center', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.circle_base': ('markings.html#fanarray.circle_base', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.coords': ('markings.html#fanarray.coords', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.from_tile_id': ('markings.html#fanarray.from_tile_id', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.outlines': ('markings.html#fanarray.outlines', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.radius': ('markings.html#fanarray.radius', 'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.semi_circle_center': ( 'markings.html#fanarray.semi_circle_center',
+                                                                                    'p4tools/markings.py'),
+                                  'p4tools.markings.FanArray.store': ('markings.html#fanarray.store', 'p4tools/markings.py'),
                                   'p4tools.markings.TileBlotches': ('markings.html#tileblotches', 'p4tools/markings.py'),
                                   'p4tools.markings.TileBlotches.__init__': ('markings.html#tileblotches.__init__', 'p4tools/markings.py'),
                                   'p4tools.markings.TileBlotches.plot': ('markings.html#tileblotches.plot', 'p4tools/markings.py'),
+                                  'p4tools.markings._arm_length': ('markings.html#_arm_length', 'p4tools/markings.py'),
+                                  'p4tools.markings._fan_arms': ('markings.html#_fan_arms', 'p4tools/markings.py'),
+                                  'p4tools.markings._unit_vectors': ('markings.html#_unit_vectors', 'p4tools/markings.py'),
+                                  'p4tools.markings._vector_norm': ('markings.html#_vector_norm', 'p4tools/markings.py'),
                                   'p4tools.markings.calc_fig_size': ('markings.html#calc_fig_size', 'p4tools/markings.py'),
                                   'p4tools.markings.rotate_vector': ('markings.html#rotate_vector', 'p4tools/markings.py'),
                                   'p4tools.markings.set_subframe_size': ('markings.html#set_subframe_size', 'p4tools/markings.py'),
                                   'p4tools.markings.show_subframe': ('markings.html#show_subframe', 'p4tools/markings.py')},
-            'p4tools.plotting': { 'p4tools.plotting._draw_histogram': ('plotting.html#_draw_histogram', 'p4tools/plotting.py'),
+            'p4tools.plotting': { 'p4tools.plotting._TileFigure': ('plotting.html#_tilefigure', 'p4tools/plotting.py'),
+                                  'p4tools.plotting._TileFigure.__init__': ('plotting.html#_tilefigure.__init__', 'p4tools/plotting.py'),
+                                  'p4tools.plotting._TileFigure.draw': ('plotting.html#_tilefigure.draw', 'p4tools/plotting.py'),
+                                  'p4tools.plotting._TileFigure.save': ('plotting.html#_tilefigure.save', 'p4tools/plotting.py'),
+                                  'p4tools.plotting._draw_histogram': ('plotting.html#_draw_histogram', 'p4tools/plotting.py'),
                                   'p4tools.plotting._get_filtered_index': ('plotting.html#_get_filtered_index', 'p4tools/plotting.py'),
+                                  'p4tools.plotting._render_chunk': ('plotting.html#_render_chunk', 'p4tools/plotting.py'),
+                                  'p4tools.plotting.add_blotches': ('plotting.html#add_blotches', 'p4tools/plotting.py'),
+                                  'p4tools.plotting.add_fans': ('plotting.html#add_fans', 'p4tools/plotting.py'),
                                   'p4tools.plotting.compute_direction_histogram': ( 'plotting.html#compute_direction_histogram',
                                                                                     'p4tools/plotting.py'),
                                   'p4tools.plotting.get_colorscale': ('plotting.html#get_colorscale', 'p4tools/plotting.py'),
@@ -99,6 +188,7 @@ d = { 'settings': { 'branch': 'master',
                                   'p4tools.plotting.plot_original_tile': ('plotting.html#plot_original_tile', 'p4tools/plotting.py'),
                                   'p4tools.plotting.plot_x_random_tiles_with_n_fans': ( 'plotting.html#plot_x_random_tiles_with_n_fans',
                                                                                         'p4tools/plotting.py'),
+                                  'p4tools.plotting.render_tiles': ('plotting.html#render_tiles', 'p4tools/plotting.py'),
                                   'p4tools.plotting.show_stamps': ('plotting.html#show_stamps', 'p4tools/plotting.py')},
             'p4tools.production.catalog': { 'p4tools.production.catalog.ReleaseManager': ( 'production.catalog.html#releasemanager',
                                                                                            'p4tools/production/catalog.py'),
@@ -164,6 +254,16 @@ d = { 'settings': { 'branch': 'master',
                                                                                                             'p4tools/production/catalog.py'),
                                             'p4tools.production.catalog.ReleaseManager.tile_coords_path_final': ( 'production.catalog.html#releasemanager.tile_coords_path_final',
                                                                                                                   'p4tools/production/catalog.py'),
+                                            'p4tools.production.catalog._attach_markings': ( 'production.catalog.html#_attach_markings',
+                                                                                             'p4tools/production/catalog.py'),
+                                            'p4tools.production.catalog._balanced_batches': ( 'production.catalog.html#_balanced_batches',
+                                                                                              'p4tools/production/catalog.py'),
+                                            'p4tools.production.catalog._cluster_tile_batch': ( 'production.catalog.html#_cluster_tile_batch',
+                                                                                                'p4tools/production/catalog.py'),
+                                            'p4tools.production.catalog._share_markings': ( 'production.catalog.html#_share_markings',
+                                                                                            'p4tools/production/catalog.py'),
+                                            'p4tools.production.catalog._tile_frame': ( 'production.catalog.html#_tile_frame',
+                                                                                        'p4tools/production/catalog.py'),
                                             'p4tools.production.catalog.add_marking_ids': ( 'production.catalog.html#add_marking_ids',
                                                                                             'p4tools/production/catalog.py'),
                                             'p4tools.production.catalog.blotch_id_generator': ( 'production.catalog.html#blotch_id_generator',
@@ -172,6 +272,8 @@ d = { 'settings': { 'branch': 'master',
                                                                                           'p4tools/production/catalog.py'),
                                             'p4tools.production.catalog.cluster_obsid_parallel': ( 'production.catalog.html#cluster_obsid_parallel',
                                                                                                    'p4tools/production/catalog.py'),
+                                            'p4tools.production.catalog.cluster_tiles_parallel': ( 'production.catalog.html#cluster_tiles_parallel',
+                                                                                                   'p4tools/production/catalog.py'),
                                             'p4tools.production.catalog.create_roi_file': ( 'production.catalog.html#create_roi_file',
                                                                                             'p4tools/production/catalog.py'),
                                             'p4tools.production.catalog.execute_in_parallel': ( 'production.catalog.html#execute_in_parallel',
@@ -194,6 +296,8 @@ d = { 'settings': { 'branch': 'master',
                                                                                                            'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.DBScanner._cluster_pipeline': ( 'production.dbscan.html#dbscanner._cluster_pipeline',
                                                                                                       'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.DBScanner._cluster_positions': ( 'production.dbscan.html#dbscanner._cluster_positions',
+                                                                                                       'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.DBScanner._setup_and_call_clustering': ( 'production.dbscan.html#dbscanner._setup_and_call_clustering',
                                                                                                                'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.DBScanner.cluster_and_plot': ( 'production.dbscan.html#dbscanner.cluster_and_plot',
@@ -206,10 +310,18 @@ d = { 'settings': { 'branch': 'master',
                                                                                                      'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.DBScanner.cluster_image_name': ( 'production.dbscan.html#dbscanner.cluster_image_name',
                                                                                                        'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.DBScanner.cluster_markings': ( 'production.dbscan.html#dbscanner.cluster_markings',
+                                                                                                     'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.DBScanner.cluster_obsid_global': ( 'production.dbscan.html#dbscanner.cluster_obsid_global',
+                                                                                                         'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.DBScanner.cluster_radii': ( 'production.dbscan.html#dbscanner.cluster_radii',
                                                                                                   'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.DBScanner.cluster_xy': ( 'production.dbscan.html#dbscanner.cluster_xy',
                                                                                                'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.DBScanner.clustering_settings': ( 'production.dbscan.html#dbscanner.clustering_settings',
+                                                                                                        'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.DBScanner.is_unchanged': ( 'production.dbscan.html#dbscanner.is_unchanged',
+                                                                                                 'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.DBScanner.min_samples': ( 'production.dbscan.html#dbscanner.min_samples',
                                                                                                 'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.DBScanner.n_clustered_blotches': ( 'production.dbscan.html#dbscanner.n_clustered_blotches',
@@ -226,30 +338,78 @@ d = { 'settings': { 'branch': 'master',
                                                                                                            'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.DBScanner.store_clustered': ( 'production.dbscan.html#dbscanner.store_clustered',
                                                                                                     'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.DBScanner.store_obsid_results': ( 'production.dbscan.html#dbscanner.store_obsid_results',
+                                                                                                        'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.DBScanner.store_tile_results': ( 'production.dbscan.html#dbscanner.store_tile_results',
+                                                                                                       'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.DBScanner.write_run_settings_file': ( 'production.dbscan.html#dbscanner.write_run_settings_file',
+                                                                                                            'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.DBScanner.write_settings_file': ( 'production.dbscan.html#dbscanner.write_settings_file',
                                                                                                         'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan._chunks': ( 'production.dbscan.html#_chunks',
+                                                                                  'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan._grid_neighbor_pairs': ( 'production.dbscan.html#_grid_neighbor_pairs',
+                                                                                               'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan._grouped_mean_std': ( 'production.dbscan.html#_grouped_mean_std',
+                                                                                            'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan._refine_clusters': ( 'production.dbscan.html#_refine_clusters',
+                                                                                           'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan._refinement_steps': ( 'production.dbscan.html#_refinement_steps',
+                                                                                            'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan._scan_tile': ( 'production.dbscan.html#_scan_tile',
+                                                                                     'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.assign_home_tiles': ( 'production.dbscan.html#assign_home_tiles',
+                                                                                            'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.average_clusters': ( 'production.dbscan.html#average_clusters',
+                                                                                           'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.get_average_objects': ( 'production.dbscan.html#get_average_objects',
                                                                                               'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.grid_dbscan': ( 'production.dbscan.html#grid_dbscan',
+                                                                                      'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.plot_parameter_scan': ( 'production.dbscan.html#plot_parameter_scan',
+                                                                                              'p4tools/production/dbscan.py'),
                                            'p4tools.production.dbscan.plot_results': ( 'production.dbscan.html#plot_results',
-                                                                                       'p4tools/production/dbscan.py')},
+                                                                                       'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.scan_parameters': ( 'production.dbscan.html#scan_parameters',
+                                                                                          'p4tools/production/dbscan.py'),
+                                           'p4tools.production.dbscan.tile_fingerprint': ( 'production.dbscan.html#tile_fingerprint',
+                                                                                           'p4tools/production/dbscan.py')},
             'p4tools.production.fnotching': { 'p4tools.production.fnotching.apply_cut': ( 'production.fnotching.html#apply_cut',
                                                                                           'p4tools/production/fnotching.py'),
                                               'p4tools.production.fnotching.apply_cut_obsid': ( 'production.fnotching.html#apply_cut_obsid',
                                                                                                 'p4tools/production/fnotching.py'),
+                                              'p4tools.production.fnotching.apply_cuts': ( 'production.fnotching.html#apply_cuts',
+                                                                                           'p4tools/production/fnotching.py'),
                                               'p4tools.production.fnotching.calc_indices_from_index': ( 'production.fnotching.html#calc_indices_from_index',
                                                                                                         'p4tools/production/fnotching.py'),
                                               'p4tools.production.fnotching.data_to_centers': ( 'production.fnotching.html#data_to_centers',
                                                                                                 'p4tools/production/fnotching.py'),
+                                              'p4tools.production.fnotching.find_close_pairs': ( 'production.fnotching.html#find_close_pairs',
+                                                                                                 'p4tools/production/fnotching.py'),
                                               'p4tools.production.fnotching.fnotch_image_ids': ( 'production.fnotching.html#fnotch_image_ids',
                                                                                                  'p4tools/production/fnotching.py'),
+                                              'p4tools.production.fnotching.fnotch_obsid': ( 'production.fnotching.html#fnotch_obsid',
+                                                                                             'p4tools/production/fnotching.py'),
                                               'p4tools.production.fnotching.get_clusters_in_path': ( 'production.fnotching.html#get_clusters_in_path',
                                                                                                      'p4tools/production/fnotching.py'),
                                               'p4tools.production.fnotching.get_id_from_path': ( 'production.fnotching.html#get_id_from_path',
                                                                                                  'p4tools/production/fnotching.py'),
+                                              'p4tools.production.fnotching.get_image_id_clusters': ( 'production.fnotching.html#get_image_id_clusters',
+                                                                                                      'p4tools/production/fnotching.py'),
+                                              'p4tools.production.fnotching.get_obsid_clusters': ( 'production.fnotching.html#get_obsid_clusters',
+                                                                                                   'p4tools/production/fnotching.py'),
+                                              'p4tools.production.fnotching.read_l1b': ( 'production.fnotching.html#read_l1b',
+                                                                                         'p4tools/production/fnotching.py'),
                                               'p4tools.production.fnotching.remove_opposing_fans': ( 'production.fnotching.html#remove_opposing_fans',
                                                                                                      'p4tools/production/fnotching.py'),
+                                              'p4tools.production.fnotching.remove_tile_duplicates': ( 'production.fnotching.html#remove_tile_duplicates',
+                                                                                                       'p4tools/production/fnotching.py'),
+                                              'p4tools.production.fnotching.write_l1b': ( 'production.fnotching.html#write_l1b',
+                                                                                          'p4tools/production/fnotching.py'),
                                               'p4tools.production.fnotching.write_l1c': ( 'production.fnotching.html#write_l1c',
-                                                                                          'p4tools/production/fnotching.py')},
+                                                                                          'p4tools/production/fnotching.py'),
+                                              'p4tools.production.fnotching.write_l1c_cuts': ( 'production.fnotching.html#write_l1c_cuts',
+                                                                                               'p4tools/production/fnotching.py')},
             'p4tools.production.io': { 'p4tools.production.io.DBManager': ('production.io.html#dbmanager', 'p4tools/production/io.py'),
                                        'p4tools.production.io.DBManager.__init__': ( 'production.io.html#dbmanager.__init__',
                                                                                      'p4tools/production/io.py'),
@@ -285,7 +445,28 @@ d = { 'settings': { 'branch': 'master',
                                                                                                     'p4tools/production/io.py'),
                                        'p4tools.production.io.DBManager.set_latest_with_dupes_db': ( 'production.io.html#dbmanager.set_latest_with_dupes_db',
                                                                                                      'p4tools/production/io.py'),
+                                       'p4tools.production.io.L1AWriter': ('production.io.html#l1awriter', 'p4tools/production/io.py'),
+                                       'p4tools.production.io.L1AWriter.__enter__': ( 'production.io.html#l1awriter.__enter__',
+                                                                                      'p4tools/production/io.py'),
+                                       'p4tools.production.io.L1AWriter.__exit__': ( 'production.io.html#l1awriter.__exit__',
+                                                                                     'p4tools/production/io.py'),
+                                       'p4tools.production.io.L1AWriter.__init__': ( 'production.io.html#l1awriter.__init__',
+                                                                                     'p4tools/production/io.py'),
+                                       'p4tools.production.io.L1AWriter._drop_old_rows': ( 'production.io.html#l1awriter._drop_old_rows',
+                                                                                           'p4tools/production/io.py'),
+                                       'p4tools.production.io.L1AWriter.append': ( 'production.io.html#l1awriter.append',
+                                                                                   'p4tools/production/io.py'),
+                                       'p4tools.production.io.L1AWriter.carry_over': ( 'production.io.html#l1awriter.carry_over',
+                                                                                       'p4tools/production/io.py'),
+                                       'p4tools.production.io.L1AWriter.close': ( 'production.io.html#l1awriter.close',
+                                                                                  'p4tools/production/io.py'),
+                                       'p4tools.production.io.L1AWriter.flush': ( 'production.io.html#l1awriter.flush',
+                                                                                  'p4tools/production/io.py'),
                                        'p4tools.production.io.PathManager': ('production.io.html#pathmanager', 'p4tools/production/io.py'),
+                                       'p4tools.production.io.PathManager.L1A_dataset': ( 'production.io.html#pathmanager.l1a_dataset',
+                                                                                          'p4tools/production/io.py'),
+                                       'p4tools.production.io.PathManager.L1A_fingerprint_file': ( 'production.io.html#pathmanager.l1a_fingerprint_file',
+                                                                                                   'p4tools/production/io.py'),
                                        'p4tools.production.io.PathManager.L1A_folder': ( 'production.io.html#pathmanager.l1a_folder',
                                                                                          'p4tools/production/io.py'),
                                        'p4tools.production.io.PathManager.L1B_folder': ( 'production.io.html#pathmanager.l1b_folder',
@@ -344,6 +525,8 @@ d = { 'settings': { 'branch': 'master',
                                                                                             'p4tools/production/io.py'),
                                        'p4tools.production.io.PathManager.reduced_fanfile': ( 'production.io.html#pathmanager.reduced_fanfile',
                                                                                               'p4tools/production/io.py'),
+                                       'p4tools.production.io.PathManager.run_settings_file': ( 'production.io.html#pathmanager.run_settings_file',
+                                                                                                'p4tools/production/io.py'),
                                        'p4tools.production.io.check_and_pad_id': ( 'production.io.html#check_and_pad_id',
                                                                                    'p4tools/production/io.py'),
                                        'p4tools.production.io.get_config': ('production.io.html#get_config', 'p4tools/production/io.py'),
@@ -351,6 +534,12 @@ d = { 'settings': { 'branch': 'master',
                                                                                 'p4tools/production/io.py'),
                                        'p4tools.production.io.get_ground_projection_root': ( 'production.io.html#get_ground_projection_root',
                                                                                              'p4tools/production/io.py'),
+                                       'p4tools.production.io.read_L1A_dataset': ( 'production.io.html#read_l1a_dataset',
+                                                                                   'p4tools/production/io.py'),
+                                       'p4tools.production.io.read_L1A_fingerprints': ( 'production.io.html#read_l1a_fingerprints',
+                                                                                        'p4tools/production/io.py'),
+                                       'p4tools.production.io.read_L1A_settings': ( 'production.io.html#read_l1a_settings',
+                                                                                    'p4tools/production/io.py'),
                                        'p4tools.production.io.set_database_path': ( 'production.io.html#set_database_path',
                                                                                     'p4tools/production/io.py')},
             'p4tools.production.markings': { 'p4tools.production.markings.Fnotch': ( 'production.markings.html#fnotch',
@@ -407,6 +596,8 @@ d = { 'settings': { 'branch': 'master',
                                                                                                'p4tools/production/markings.py'),
                                              'p4tools.production.markings.calc_fig_size': ( 'production.markings.html#calc_fig_size',
                                                                                             'p4tools/production/markings.py'),
+                                             'p4tools.production.markings.fnotch_table': ( 'production.markings.html#fnotch_table',
+                                                                                           'p4tools/production/markings.py'),
                                              'p4tools.production.markings.set_subframe_size': ( 'production.markings.html#set_subframe_size',
                                                                                                 'p4tools/production/markings.py')},
             'p4tools.production.metadata': { 'p4tools.production.metadata.MetadataReader': ( 'production.metadata.html#metadatareader',
@@ -491,4 +682,11 @@ d = { 'settings': { 'branch': 'master',
                                                                                                               'p4tools/production/projection.py'),
                                                'p4tools.production.projection.stitch_cubenorm': ( 'production.projection.html#stitch_cubenorm',
                                                                                                   'p4tools/production/projection.py')},
-            'p4tools.stats': {'p4tools.stats.define_martian_year': ('stats.html#define_martian_year', 'p4tools/stats.py')}}}
+            'p4tools.stats': { 'p4tools.stats._like': ('stats.html#_like', 'p4tools/stats.py'),
+                               'p4tools.stats._to_datetime64': ('stats.html#_to_datetime64', 'p4tools/stats.py'),
+                               'p4tools.stats._year_positions': ('stats.html#_year_positions', 'p4tools/stats.py'),
+                               'p4tools.stats.define_martian_year': ('stats.html#define_martian_year', 'p4tools/stats.py'),
+                               'p4tools.stats.define_time_columns': ('stats.html#define_time_columns', 'p4tools/stats.py'),
+                               'p4tools.stats.l_s_bins': ('stats.html#l_s_bins', 'p4tools/stats.py'),
+                               'p4tools.stats.martian_year': ('stats.html#martian_year', 'p4tools/stats.py'),
+                               'p4tools.stats.martian_year_fraction': ('stats.html#martian_year_fraction', 'p4tools/stats.py')}}}
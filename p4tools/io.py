@@ -1,20 +1,40 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../notebooks/00_io.ipynb.
 
 # %% auto 0
-__all__ = ['logger', 'base_url', 'urls', 'hashes', 'fetch_zipped_file', 'get_blotch_catalog', 'get_fan_catalog', 'get_meta_data',
-           'get_tile_coords', 'get_region_names', 'get_tile_urls', 'get_subframe', 'get_url_for_tile_id',
-           'get_subframe_by_tile_id', 'get_fans_for_tile', 'get_blotches_for_tile', 'get_hirise_id_for_tile']
+__all__ = ['logger', 'base_url', 'urls', 'hashes', 'catalog_cache', 'CATEGORICAL_COLUMNS', 'ROW_GROUP_SIZE', 'LAT_COLUMN',
+           'LON_COLUMN', 'tile_image_store', 'fetch_zipped_file', 'CatalogCache', 'invalidate', 'get_columnar_path',
+           'get_blotch_catalog', 'get_fan_catalog', 'get_meta_data', 'get_tile_coords', 'get_region_names',
+           'get_tile_urls', 'TileIndex', 'get_tile_index', 'get_tiles_cache_path', 'get_subframe',
+           'get_url_for_tile_id', 'TileImageStore', 'get_subframe_by_tile_id', 'get_fans_for_tile',
+           'get_blotches_for_tile', 'get_hirise_id_for_tile', 'get_markings_for_tiles', 'prefetch_urls',
+           'prefetch_subframes']
 
 # %% ../notebooks/00_io.ipynb 2
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.error import URLError
 
 import matplotlib.image as mplimg
+import numpy as np
 import pooch
 from yarl import URL
 
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # without pyarrow the catalogs are read from the CSV files every time
+    pa = pq = None
+
+try:
+    from tqdm.auto import tqdm
+except ImportError:
+    tqdm = None
+
 # %% ../notebooks/00_io.ipynb 3
 logger = pooch.get_logger()
 logger.setLevel("WARNING")
@@ -63,57 +83,544 @@ def fetch_zipped_file(key):
     return fpath[0]
 
 # %% ../notebooks/00_io.ipynb 7
-def get_blotch_catalog() -> pd.DataFrame:
-    return pd.read_csv(fetch_zipped_file('blotches'))
+class CatalogCache:
+    """Process-level LRU cache for parsed catalog tables.
+
+    Entries are keyed by the catalog key and its known hash, so that a catalog
+    update on Zenodo (i.e. a new entry in `hashes`) never serves stale data.
+
+    Parameters
+    ----------
+    max_memory : int, optional
+        Upper limit in bytes for all cached tables together. Least recently used
+        tables are evicted when a new table would exceed it. Default: 4 GB.
+
+    Notes
+    -----
+    Cached items are shared between callers of `get`. The public catalog loaders
+    hand out copies of them (see `_read_catalog`).
+
+    Attributes
+    ----------
+    hits, misses : int
+        Counters for cache lookups.
+    """
+
+    def __init__(self, max_memory=4 * 1024**3):
+        self.max_memory = max_memory
+        self._store = OrderedDict()
+        self._sizes = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _sizeof(obj):
+        try:
+            return int(obj.memory_usage(deep=True).sum())
+        except AttributeError:
+            return int(getattr(obj, 'nbytes', 0))
+
+    @property
+    def nbytes(self):
+        "int : Memory currently held by the cached tables."
+        return sum(self._sizes.values())
+
+    def get(self, key, loader):
+        """Return cached item for `key`, calling `loader()` on a miss.
+
+        Parameters
+        ----------
+        key : hashable
+            Cache key, usually a tuple of (catalog key, hash).
+        loader : callable
+            Function without arguments that produces the item.
+        """
+        try:
+            item = self._store[key]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._store.move_to_end(key)
+            return item
+        item = loader()
+        size = self._sizeof(item)
+        if size > self.max_memory:
+            # never cache something that would evict everything else and still not fit
+            return item
+        while self._store and self.nbytes + size > self.max_memory:
+            old_key, _ = self._store.popitem(last=False)
+            del self._sizes[old_key]
+            logger.info("Evicted %s from catalog cache.", old_key)
+        self._store[key] = item
+        self._sizes[key] = size
+        return item
+
+    def invalidate(self, key=None):
+        """Remove cached items.
+
+        Parameters
+        ----------
+        key : str, optional
+            Catalog key as used in `urls` (e.g. 'fans'). All entries belonging to it,
+            including derived lookup tables, are dropped. If None, clear the whole cache.
+        """
+        if key is None:
+            self._store.clear()
+            self._sizes.clear()
+            return
+        for k in [k for k in self._store if k[0] == key]:
+            del self._store[k]
+            del self._sizes[k]
 
+    def __contains__(self, key):
+        return key in self._store
 
-def get_fan_catalog() -> pd.DataFrame:
-    return pd.read_csv(fetch_zipped_file('fans'))
+    def __len__(self):
+        return len(self._store)
 
+    def __repr__(self):
+        return (f"CatalogCache(n_items={len(self)}, nbytes={self.nbytes}, "
+                f"max_memory={self.max_memory}, hits={self.hits}, misses={self.misses})")
 
-def get_meta_data() -> pd.DataFrame:
-    return pd.read_csv(fetch_zipped_file('metadata'))
 
+catalog_cache = CatalogCache()
 
-def get_tile_coords() -> pd.DataFrame:
-    return pd.read_csv(fetch_zipped_file('tile_coords'))
 
+def invalidate(key=None):
+    "Drop `key` (or everything, if None) from the process-level catalog cache."
+    catalog_cache.invalidate(key)
 
-def get_region_names() -> pd.DataFrame:
-    return pd.read_csv(fetch_zipped_file('region_names'))
 
-def get_tile_urls() -> pd.DataFrame:
-    return pd.read_csv(fetch_zipped_file('tile_urls'))
+def _cached(key, loader, *extra):
+    "Memoize `loader` in `catalog_cache` under the catalog `key`, its hash and `extra`."
+    return catalog_cache.get((key, hashes.get(key), *extra), loader)
 
 # %% ../notebooks/00_io.ipynb 9
+CATEGORICAL_COLUMNS = ['tile_id', 'obsid']
+
+# rows per Parquet row group. Smaller groups let filtered reads skip more data
+# via the row group statistics.
+ROW_GROUP_SIZE = 50_000
+
+LAT_COLUMN = 'PlanetocentricLatitude'
+LON_COLUMN = 'Longitude'
+
+_HASH_METADATA_KEY = b'p4tools.source_hash'
+
+
+def get_columnar_path(key) -> Path:
+    """Path of the Parquet sidecar for catalog `key`.
+
+    It sits next to the pooch-cached download and carries the known hash of the
+    source archive in its name, so a new catalog version never picks up an old sidecar.
+    """
+    md5 = hashes[key].split(':')[-1]
+    name = Path(urls[key]).stem.removesuffix('.csv')
+    return Path(pooch.os_cache('p4tools')) / f"{name}.{md5}.parquet"
+
+
+def _optimize_dtypes(df) -> pd.DataFrame:
+    "Store the repetitive id columns as categoricals."
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and df[col].nunique() < len(df) / 2:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _read_columnar(key, path, columns=None, filters=None):
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        if metadata.get(_HASH_METADATA_KEY) != hashes[key].encode():
+            logger.warning("Hash mismatch for %s, recreating it.", path)
+            return None
+        if filters:
+            # typed id sets, as pyarrow cannot match an empty (null typed) list to a column
+            filters = [(col, op, pa.array(value, pa.string()) if op == 'in' else value)
+                       for col, op, value in filters]
+        table = pq.read_table(path, columns=columns, filters=filters or None)
+    except (pa.ArrowInvalid, OSError):
+        logger.warning("Could not read %s, recreating it.", path)
+        return None
+    return table.to_pandas()
+
+
+def _write_columnar(df, key, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), _HASH_METADATA_KEY: hashes[key].encode()}
+    tmppath = path.with_suffix('.tmp')
+    try:
+        pq.write_table(table.replace_schema_metadata(metadata), tmppath, row_group_size=ROW_GROUP_SIZE)
+        tmppath.replace(path)
+    except OSError:
+        logger.warning("Could not write columnar sidecar %s.", path)
+
+
+def _load_catalog(key) -> pd.DataFrame:
+    """Load catalog `key` from its Parquet sidecar, creating it from the CSV if required."""
+    path = get_columnar_path(key)
+    if pq is not None and path.exists():
+        df = _read_columnar(key, path)
+        if df is not None:
+            return df
+    df = _optimize_dtypes(pd.read_csv(fetch_zipped_file(key)))
+    if pq is not None:
+        _write_columnar(df, key, path)
+    return df
+
+
+def _build_filters(obsids=None, tile_ids=None, l_s=None, lat=None, lon=None):
+    "Translate the catalog selection arguments into (column, op, value) filters."
+    filters = []
+    if obsids is not None:
+        filters.append(('obsid', 'in', list(obsids)))
+    if tile_ids is not None:
+        filters.append(('tile_id', 'in', list(tile_ids)))
+    for col, bounds in [('l_s', l_s), (LAT_COLUMN, lat), (LON_COLUMN, lon)]:
+        if bounds is not None:
+            low, high = bounds
+            filters += [(col, '>=', low), (col, '<=', high)]
+    return filters
+
+
+def _apply_filters(df, filters) -> pd.DataFrame:
+    "In-memory equivalent of the filters handed to the Parquet reader."
+    mask = np.ones(len(df), dtype=bool)
+    for col, op, value in filters:
+        if op == 'in':
+            mask &= df[col].isin(value).to_numpy()
+        elif op == '>=':
+            mask &= (df[col] >= value).to_numpy()
+        elif op == '<=':
+            mask &= (df[col] <= value).to_numpy()
+        else:
+            raise ValueError(f"Unknown filter operation: {op}")
+    return df[mask]
+
+
+def _read_catalog(key, columns=None, **selection) -> pd.DataFrame:
+    """Read catalog `key`, optionally only `columns` and rows matching `selection`.
+
+    Without `columns` and `selection` the full catalog is served from `catalog_cache`,
+    as a shallow copy, so that callers can add or change columns without changing the
+    cached table (with pandas' copy-on-write, no data is copied). Otherwise an already cached catalog is filtered in memory, or the projection and
+    filters are pushed down to the Parquet reader, so that only the required columns
+    and row groups are read from disk.
+    """
+    filters = _build_filters(**selection)
+    if columns is None and not filters:
+        return _cached(key, lambda: _load_catalog(key)).copy(deep=False)
+    path = get_columnar_path(key)
+    if (key, hashes.get(key)) not in catalog_cache and pq is not None and path.exists():
+        df = _read_columnar(key, path, columns, filters)
+        if df is not None:
+            return df
+    df = _apply_filters(_cached(key, lambda: _load_catalog(key)), filters)
+    if columns is not None:
+        df = df[list(columns)]
+    return df.reset_index(drop=True)
+
+
+def get_blotch_catalog(columns=None, obsids=None, tile_ids=None, l_s=None, lat=None, lon=None) -> pd.DataFrame:
+    """Return the blotch catalog, optionally restricted to `columns` and a selection of rows.
+
+    Parameters
+    ----------
+    columns : list of str, optional
+        Columns to read. Default: all.
+    obsids, tile_ids : iterable of str, optional
+        Only return markings of these HiRISE obsids or Planet Four tile_ids.
+    l_s, lat, lon : tuple of float, optional
+        Inclusive (min, max) ranges for solar longitude, planetocentric latitude
+        and east longitude.
+    """
+    return _read_catalog('blotches', columns, obsids=obsids, tile_ids=tile_ids, l_s=l_s, lat=lat, lon=lon)
+
+
+def get_fan_catalog(columns=None, obsids=None, tile_ids=None, l_s=None, lat=None, lon=None) -> pd.DataFrame:
+    """Return the fan catalog, optionally restricted to `columns` and a selection of rows.
+
+    See `get_blotch_catalog` for the parameters.
+    """
+    return _read_catalog('fans', columns, obsids=obsids, tile_ids=tile_ids, l_s=l_s, lat=lat, lon=lon)
+
+
+def get_meta_data(columns=None) -> pd.DataFrame:
+    return _read_catalog('metadata', columns)
+
+
+def get_tile_coords(columns=None) -> pd.DataFrame:
+    return _read_catalog('tile_coords', columns)
+
+
+def get_region_names(columns=None) -> pd.DataFrame:
+    return _read_catalog('region_names', columns)
+
+def get_tile_urls(columns=None) -> pd.DataFrame:
+    return _read_catalog('tile_urls', columns)
+
+# %% ../notebooks/00_io.ipynb 13
+class TileIndex:
+    """Offset table over a marking catalog for slicing out the rows of single tiles.
+
+    The catalog itself is not copied: the index stores the row permutation that sorts
+    the catalog by `column` and, per tile, the start and stop into that permutation.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Marking catalog with a `column` column.
+    column : str, optional
+        Column to index on. Default: 'tile_id'
+    """
+
+    def __init__(self, df, column='tile_id'):
+        self.df = df
+        self.column = column
+        codes, uniques = pd.factorize(df[column])
+        valid = np.flatnonzero(codes >= 0)
+        self.order = valid[np.argsort(codes[valid], kind='stable')]
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(codes[valid], minlength=len(uniques)))])
+        self.offsets = dict(zip(uniques, zip(bounds[:-1].tolist(), bounds[1:].tolist())))
+
+    @property
+    def nbytes(self):
+        "int : Approximate memory of the index, without the indexed catalog."
+        return self.order.nbytes + 100 * len(self.offsets)
+
+    @property
+    def tile_ids(self):
+        return list(self.offsets)
+
+    def __contains__(self, tile_id):
+        return tile_id in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def positions(self, tile_ids):
+        "Return the integer row positions of all `tile_ids`, grouped per tile."
+        slices = [self.order[slice(*self.offsets[tid])] for tid in tile_ids if tid in self.offsets]
+        if not slices:
+            return self.order[:0]
+        return np.concatenate(slices)
+
+    def get(self, tile_id):
+        "Return the rows of `tile_id` (empty frame if unknown)."
+        start, stop = self.offsets.get(tile_id, (0, 0))
+        return self.df.take(self.order[start:stop])
+
+    def get_many(self, tile_ids):
+        "Return the rows of all `tile_ids` in one gather, grouped per tile."
+        return self.df.take(self.positions(tile_ids))
+
+
+def get_tile_index(key) -> TileIndex:
+    """Return the cached `TileIndex` for catalog `key` ('fans' or 'blotches')."""
+    return _cached(key, lambda: TileIndex(_read_catalog(key)), 'by_tile_id')
+
+# %% ../notebooks/00_io.ipynb 16
+def get_tiles_cache_path() -> Path:
+    "Folder where the downloaded tile images are cached."
+    return Path(pooch.os_cache('p4tools/tiles'))
+
+
+def _retrieve_subframe(url, path=None, progressbar=True):
+    path = get_tiles_cache_path() if path is None else path
+    return pooch.retrieve(url, path=path, known_hash=None, progressbar=progressbar)
+
+
 def get_subframe(url):
-    targetpath = pooch.retrieve(url, path=pooch.os_cache('p4tools/tiles'), known_hash=None, progressbar=True)
+    targetpath = _retrieve_subframe(url)
     im = mplimg.imread(targetpath)
     return im
 
-# %% ../notebooks/00_io.ipynb 10
+# %% ../notebooks/00_io.ipynb 17
 def get_url_for_tile_id(tile_id):
-    return get_tile_urls().set_index('tile_id').squeeze().at[tile_id]
+    urls_by_id = _cached('tile_urls', lambda: get_tile_urls().set_index('tile_id').squeeze(), 'by_tile_id')
+    return urls_by_id.at[tile_id]
 
-# %% ../notebooks/00_io.ipynb 12
-def get_subframe_by_tile_id(tile_id):
-    url = get_url_for_tile_id(tile_id)
-    return get_subframe(url)
+# %% ../notebooks/00_io.ipynb 18
+def _to_uint8(im):
+    "Convert decoded image data to uint8, as PNGs are decoded to floats in [0, 1]."
+    if im.dtype == np.uint8:
+        return im
+    return (np.clip(im, 0, 1) * 255).round().astype(np.uint8)
 
-# %% ../notebooks/00_io.ipynb 13
+
+class TileImageStore:
+    """Store of decoded tile images as memory-mapped uint8 arrays.
+
+    Each tile is decoded once and written as `<tile_id>.npy` into `path`. Later reads
+    return read-only memory-mapped views of these files, so no decoding and no copy
+    happens. Recently used tiles are additionally kept in an in-memory LRU.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path, optional
+        Folder for the decoded arrays. Default: 'decoded' inside the tile cache folder.
+    max_memory : int, optional
+        Memory limit in bytes for the LRU of hot tiles. Default: 512 MB.
+    """
+
+    def __init__(self, path=None, max_memory=512 * 1024**2):
+        self._path = None if path is None else Path(path)
+        self.hot = CatalogCache(max_memory)
+
+    @property
+    def path(self):
+        return get_tiles_cache_path() / 'decoded' if self._path is None else self._path
+
+    def file_for(self, tile_id) -> Path:
+        return self.path / f"{tile_id}.npy"
+
+    def __contains__(self, tile_id):
+        return self.file_for(tile_id).exists()
+
+    def put(self, tile_id, image):
+        "Write decoded `image` for `tile_id` and return its memory-mapped view."
+        fpath = self.file_for(tile_id)
+        fpath.parent.mkdir(parents=True, exist_ok=True)
+        tmppath = fpath.with_suffix('.tmp.npy')
+        np.save(tmppath, _to_uint8(image))
+        # rename is atomic, so concurrent readers never see partial files
+        tmppath.replace(fpath)
+        return np.load(fpath, mmap_mode='r')
+
+    def _load(self, tile_id, decoder):
+        fpath = self.file_for(tile_id)
+        try:
+            return np.load(fpath, mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            return self.put(tile_id, decoder())
+
+    def get(self, tile_id, decoder):
+        """Return the decoded image of `tile_id`, calling `decoder()` if it is not stored yet.
+
+        The returned array is read-only, copy it before modifying.
+        """
+        return self.hot.get((tile_id,), lambda: self._load(tile_id, decoder))
+
+    def invalidate(self, tile_id=None):
+        "Drop `tile_id` (or all tiles, if None) from the LRU of hot tiles."
+        self.hot.invalidate(tile_id)
+
+
+tile_image_store = TileImageStore()
+
+# %% ../notebooks/00_io.ipynb 21
+def get_subframe_by_tile_id(tile_id, copy=False):
+    """Return the tile image as uint8 array, decoded only once via `tile_image_store`.
+
+    Parameters
+    ----------
+    tile_id : str
+        Planet Four tile_id
+    copy : bool, optional
+        If False, return the read-only memory-mapped view of the stored image. If True,
+        return a writable copy, e.g. to draw into the image. Default: False
+    """
+    image = tile_image_store.get(tile_id, lambda: get_subframe(get_url_for_tile_id(tile_id)))
+    return np.array(image) if copy else image
+
+# %% ../notebooks/00_io.ipynb 23
 def get_fans_for_tile(tile_id):
-    fans = get_fan_catalog()
-    return fans.query("tile_id == @tile_id")
+    return get_tile_index('fans').get(tile_id)
 
-# %% ../notebooks/00_io.ipynb 14
+# %% ../notebooks/00_io.ipynb 24
 def get_blotches_for_tile(tile_id):
-    blotches = get_blotch_catalog()
-    return blotches.query("tile_id == @tile_id")
+    return get_tile_index('blotches').get(tile_id)
 
-# %% ../notebooks/00_io.ipynb 15
+# %% ../notebooks/00_io.ipynb 25
 def get_hirise_id_for_tile(tile_id):
     try:
-        obsid = get_fan_catalog().query("tile_id == @tile_id").obsid.iloc[0]
-    except:
-        obsid = get_blotch_catalog().query("tile_id == @tile_id").obsid.iloc[0]
+        obsid = get_fans_for_tile(tile_id).obsid.iloc[0]
+    except IndexError:
+        obsid = get_blotches_for_tile(tile_id).obsid.iloc[0]
     return obsid
+
+# %% ../notebooks/00_io.ipynb 26
+def get_markings_for_tiles(tile_ids):
+    """Return fans and blotches for all `tile_ids` in one pass over each catalog.
+
+    Parameters
+    ----------
+    tile_ids : iterable of str
+        Planet Four tile_ids
+
+    Returns
+    -------
+    fans, blotches : pandas.DataFrame
+        Marking rows of the requested tiles, grouped by tile_id in the given order.
+    """
+    tile_ids = list(dict.fromkeys(tile_ids))
+    return get_tile_index('fans').get_many(tile_ids), get_tile_index('blotches').get_many(tile_ids)
+
+# %% ../notebooks/00_io.ipynb 28
+def _retrieve_with_retries(url, path, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            return _retrieve_subframe(url, path=path, progressbar=False)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            logger.info("Retrying %s after error: %s", url, e)
+            time.sleep(backoff * 2**attempt)
+
+
+def prefetch_urls(urls, max_workers=8, retries=3, backoff=0.5, path=None, progressbar=True):
+    """Download tile images concurrently into the tile cache.
+
+    Parameters
+    ----------
+    urls : iterable of str
+        Image URLs to fetch. Already cached files are not downloaded again.
+    max_workers : int, optional
+        Maximum number of concurrent downloads.
+    retries : int, optional
+        How often a failed download is retried, with exponential back-off.
+    backoff : float, optional
+        Seconds to wait before the first retry.
+    path : str or pathlib.Path, optional
+        Cache folder. Default: `get_tiles_cache_path()`
+    progressbar : bool, optional
+        Show a tqdm progress bar over all downloads, if tqdm is installed.
+
+    Returns
+    -------
+    dict
+        Local file path per url, None for downloads that failed after all retries.
+    """
+    urls = list(dict.fromkeys(urls))
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_retrieve_with_retries, url, path, retries, backoff): url
+                   for url in urls}
+        done = as_completed(futures)
+        if progressbar and tqdm is not None:
+            done = tqdm(done, total=len(futures), desc="Prefetching tiles")
+        for future in done:
+            url = futures[future]
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                logger.warning("Failed to fetch %s: %s", url, e)
+                results[url] = None
+    return results
+
+
+def prefetch_subframes(tile_ids, max_workers=8, retries=3, backoff=0.5, progressbar=True):
+    """Warm the tile image cache for `tile_ids`, so that `get_subframe_by_tile_id` runs from disk.
+
+    See `prefetch_urls` for the parameters.
+
+    Returns
+    -------
+    dict
+        Local file path per tile_id, None for tiles that could not be fetched.
+    """
+    tile_ids = list(dict.fromkeys(tile_ids))
+    urls = {tile_id: get_url_for_tile_id(tile_id) for tile_id in tile_ids}
+    paths = prefetch_urls(urls.values(), max_workers=max_workers, retries=retries,
+                          backoff=backoff, progressbar=progressbar)
+    return {tile_id: paths[url] for tile_id, url in urls.items()}
@@ -2,7 +2,7 @@
 
 # %% auto 0
 __all__ = ['IMG_X_SIZE', 'IMG_Y_SIZE', 'show_subframe', 'set_subframe_size', 'calc_fig_size', 'Blotch', 'TileBlotches',
-           'rotate_vector', 'Fan']
+           'BlotchArray', 'rotate_vector', 'Fan', 'FanArray']
 
 # %% ../notebooks/01_markings.ipynb 2
 import math
@@ -83,8 +83,7 @@ class Blotch(Ellipse):
 
     @classmethod
     def from_tile_id(cls, tile_id, n=0, **kwargs):
-        df = io.get_blotch_catalog()
-        data = df[df.tile_id == tile_id].iloc[n]
+        data = io.get_blotches_for_tile(tile_id).iloc[n]
         return cls(data, **kwargs)
         
     def __init__(self, data, scope="planet4", with_center=False, url_db="", **kwargs):
@@ -273,7 +272,77 @@ class TileBlotches:
         ax.add_collection(self.p)
         set_subframe_size(ax)
 
-# %% ../notebooks/01_markings.ipynb 16
+# %% ../notebooks/01_markings.ipynb 14
+class BlotchArray:
+    """Vectorized geometry for a table of blotches.
+
+    Computes centers, areas and limit points of all rows at once. Single rows can
+    still be accessed as `Blotch` objects by indexing.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Blotch marking data with columns [`x`, `y`, `radius_1`, `radius_2`, `angle`]
+        (`image_x`, `image_y` for the 'hirise' scope).
+    scope : {'planet4', 'hirise'}
+        string that decides between using x/y or image_x/image_y as center coords
+    """
+
+    def __init__(self, data, scope="planet4"):
+        if scope not in ["hirise", "planet4"]:
+            raise TypeError("Unknown scope: {}".format(scope))
+        self.data = data
+        self.scope = scope
+        xcol, ycol = ("x", "y") if scope == "planet4" else ("image_x", "image_y")
+        self.center = data[[xcol, ycol]].to_numpy(dtype="float")
+        self.angle = data.angle.to_numpy(dtype="float")
+        self.radius_1 = data.radius_1.to_numpy(dtype="float")
+        self.radius_2 = data.radius_2.to_numpy(dtype="float")
+
+    @classmethod
+    def from_tile_id(cls, tile_id, **kwargs):
+        return cls(io.get_blotches_for_tile(tile_id), **kwargs)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, i):
+        "Return the `Blotch` object for row number `i`."
+        return Blotch(self.data.iloc[i], scope=self.scope)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def area(self):
+        return pi * self.radius_1 * self.radius_2
+
+    @property
+    def semi_axis_1(self):
+        # same as `Blotch.x1`, `Blotch.y1`, including the sine taking the angle
+        # in degrees unconverted, so that both classes agree.
+        return np.column_stack([np.cos(np.radians(self.angle)) * self.radius_1,
+                                np.sin(self.angle) * self.radius_1])
+
+    @property
+    def semi_axis_2(self):
+        return self.radius_2[:, None] * _unit_vectors(self.angle + 90)
+
+    @property
+    def limit_points(self):
+        "np.array, shape (n, 4, 2) : p1, p2, p3, p4 of every blotch."
+        a1, a2 = self.semi_axis_1, self.semi_axis_2
+        return np.stack([self.center + a1, self.center - a1, self.center + a2, self.center - a2], axis=1)
+
+    def store(self):
+        "Return a copy of `data` with the limit points added, like `Blotch.store`."
+        out = self.data.copy()
+        for i, point in enumerate(np.moveaxis(self.limit_points, 1, 0)):
+            out[f"p{i + 1}_x"] = point[:, 0]
+            out[f"p{i + 1}_y"] = point[:, 1]
+        return out
+
+# %% ../notebooks/01_markings.ipynb 17
 def rotate_vector(v, angle):
     """Rotate vector by angle given in degrees.
 
@@ -288,7 +357,44 @@ def rotate_vector(v, angle):
     rotmat = np.array([[cos(rangle), -sin(rangle)], [sin(rangle), cos(rangle)]])
     return rotmat.dot(v)
 
-# %% ../notebooks/01_markings.ipynb 17
+# %% ../notebooks/01_markings.ipynb 18
+def _unit_vectors(angle):
+    "Unit vectors for `angle` in degrees, stacked along a new last axis."
+    rangle = np.radians(angle)
+    return np.stack([np.cos(rangle), np.sin(rangle)], axis=-1)
+
+
+def _vector_norm(v):
+    """Euclidean norm along the last axis.
+
+    Computed as a dot product per vector, like `LA.norm` of a single vector, so that
+    the results agree with `Fan.radius` to the last bit.
+    """
+    return np.sqrt(np.matmul(v[..., None, :], v[..., :, None])[..., 0, 0])
+
+
+def _arm_length(inside_half, distance):
+    half = np.radians(inside_half)
+    return distance / (np.cos(half) + np.sin(half))
+
+
+def _fan_arms(angle, spread, distance):
+    """Arm vectors of fans, for scalars or arrays of fan parameters.
+
+    Returns
+    -------
+    inside_half, armlength : float or np.array
+    v1, v2 : np.array
+        Arm vectors relative to the base, shape (..., 2)
+    """
+    inside_half = spread / 2.0
+    armlength = _arm_length(inside_half, distance)
+    length = np.expand_dims(armlength, -1)
+    v1 = length * _unit_vectors(angle - inside_half)
+    v2 = length * _unit_vectors(angle + inside_half)
+    return inside_half, armlength, v1, v2
+
+# %% ../notebooks/01_markings.ipynb 19
 class Fan(lines.Line2D):
     """Fan management class for P4.
 
@@ -329,8 +435,7 @@ class Fan(lines.Line2D):
 
     @classmethod
     def from_tile_id(cls, tile_id, n=0, **kwargs):
-        df = io.get_fan_catalog()
-        data = df[df.tile_id==tile_id].iloc[n]
+        data = io.get_fans_for_tile(tile_id).iloc[n]
         return cls(data, **kwargs)
         
     def __init__(self, data, scope="planet4", with_center=False, **kwargs):
@@ -350,16 +455,10 @@ class Fan(lines.Line2D):
             raise KeyError
         # default n_members value (property)
         self._n_members = 1
-        # angles
-        self.inside_half = self.data.spread / 2.0
-        alpha = self.data.angle - self.inside_half
-        beta = self.data.angle + self.inside_half
-        # length of arms
-        self.armlength = self.get_arm_length()
-        # first arm
-        self.v1 = rotate_vector([self.armlength, 0], alpha)
-        # second arm
-        self.v2 = rotate_vector([self.armlength, 0], beta)
+        # half opening angle, length of arms and the two arm vectors.
+        # Shared with `FanArray`, so both give identical results.
+        self.inside_half, self.armlength, self.v1, self.v2 = _fan_arms(
+            self.data.angle, self.data.spread, self.data.distance)
         # vector matrix, stows the 1D vectors row-wise
         self.coords = np.vstack(
             (self.base + self.v1, self.base, self.base + self.v2))
@@ -395,8 +494,7 @@ class Fan(lines.Line2D):
         self._n_members = value
 
     def get_arm_length(self):
-        half = radians(self.inside_half)
-        return self.data.distance / (cos(half) + sin(half))
+        return _arm_length(self.inside_half, self.data.distance)
 
     @property
     def area(self):
@@ -483,8 +581,7 @@ class Fan(lines.Line2D):
         As total length, I define the armlength + the radius of the semi-circle
         at the end.
         """
-        mid_point_vec = rotate_vector([0.5 * (self.armlength + self.radius), 0],
-                                      self.data.angle)
+        mid_point_vec = 0.5 * (self.armlength + self.radius) * _unit_vectors(self.data.angle)
         return self.base + mid_point_vec
 
     def plot_center(self, ax, color="b"):
@@ -562,3 +659,123 @@ class Fan(lines.Line2D):
 
         df = pd.DataFrame(np.vstack([self.coords[::-1][:2], np.array(rotated.xy).T]))
         return geom.Polygon(df.round(2).drop_duplicates().values)
+
+# %% ../notebooks/01_markings.ipynb 20
+class FanArray:
+    """Vectorized geometry for a table of fans.
+
+    All geometric quantities of `Fan` are computed for every row at once with
+    NumPy array operations. Single rows can still be accessed as `Fan` objects
+    by indexing.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Fan marking data with columns [`x`, `y`, `angle`, `spread`, `distance`]
+        (`image_x`, `image_y` for the 'hirise' scope).
+    scope : {'planet4', 'hirise'}
+        string that decides between using x/y or image_x/image_y as base coords
+
+    Attributes
+    ----------
+    base : np.array, shape (n, 2)
+    inside_half, armlength : np.array, shape (n,)
+    v1, v2 : np.array, shape (n, 2)
+        Arm vectors relative to the base.
+    """
+
+    def __init__(self, data, scope="planet4"):
+        if scope not in ["hirise", "planet4"]:
+            raise TypeError("Unknown scope: {}".format(scope))
+        self.data = data
+        self.scope = scope
+        xcol, ycol = ("x", "y") if scope == "planet4" else ("image_x", "image_y")
+        self.base = data[[xcol, ycol]].to_numpy(dtype="float")
+        self.angle = data.angle.to_numpy(dtype="float")
+        self.inside_half, self.armlength, self.v1, self.v2 = _fan_arms(
+            self.angle,
+            data.spread.to_numpy(dtype="float"),
+            data.distance.to_numpy(dtype="float"),
+        )
+
+    @classmethod
+    def from_tile_id(cls, tile_id, **kwargs):
+        return cls(io.get_fans_for_tile(tile_id), **kwargs)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, i):
+        "Return the `Fan` object for row number `i`."
+        return Fan(self.data.iloc[i], scope=self.scope)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def arm1(self):
+        "np.array, shape (n, 2) : end points of the first arms."
+        return self.base + self.v1
+
+    @property
+    def arm2(self):
+        "np.array, shape (n, 2) : end points of the second arms."
+        return self.base + self.v2
+
+    @property
+    def coords(self):
+        "np.array, shape (n, 3, 2) : arm1->base->arm2 line coordinates per fan."
+        return np.stack([self.arm1, self.base, self.arm2], axis=1)
+
+    @property
+    def circle_base(self):
+        return self.v1 - self.v2
+
+    @property
+    def semi_circle_center(self):
+        return self.base + self.v2 + 0.5 * self.circle_base
+
+    @property
+    def radius(self):
+        return 0.5 * _vector_norm(self.circle_base)
+
+    @property
+    def center(self):
+        "np.array, shape (n, 2) : point at half of armlength + radius along `angle`."
+        mid_point_vec = np.expand_dims(0.5 * (self.armlength + self.radius), -1) * _unit_vectors(self.angle)
+        return self.base + mid_point_vec
+
+    @property
+    def area(self):
+        """Same as `Fan.area`, up to rounding.
+
+        NumPy squares arrays by multiplication, but single floats via `pow`, so single
+        values can differ from `Fan.area` in the last bit.
+        """
+        tr_h = np.sqrt(np.square(self.armlength) - np.square(self.radius))
+        return tr_h * self.radius + 0.5 * pi * np.square(self.radius)
+
+    def outlines(self, n_arc=21):
+        """Closed outline per fan: arm1 -> base -> arm2 -> semi-circle -> arm1.
+
+        The semi-circle is the same arc that `Fan.add_semicircle` draws as a wedge.
+
+        Returns
+        -------
+        np.array, shape (n, 3 + n_arc, 2)
+        """
+        circle_base = self.circle_base
+        theta1 = np.arctan2(circle_base[:, 1], circle_base[:, 0])
+        # the wedge runs from arm1 (theta1) to arm2 (theta1 + 180), walk it backwards
+        theta = theta1[:, None] + np.linspace(pi, 0, n_arc)
+        arc = self.semi_circle_center[:, None, :] + self.radius[:, None, None] * np.stack(
+            [np.cos(theta), np.sin(theta)], axis=-1)
+        return np.concatenate([self.coords, arc], axis=1)
+
+    def store(self):
+        "Return a copy of `data` with the arm end points added, like `Fan.store`."
+        out = self.data.copy()
+        for i, arm in enumerate([self.arm1, self.arm2]):
+            out["arm{}_x".format(i + 1)] = arm[:, 0]
+            out["arm{}_y".format(i + 1)] = arm[:, 1]
+        return out
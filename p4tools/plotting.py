@@ -1,72 +1,154 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../notebooks/02_plotting.ipynb.
 
 # %% auto 0
-__all__ = ['plot_blotches_for_tile', 'plot_fans_for_tile', 'plot_original_tile', 'plot_original_and_fans',
-           'plot_original_and_blotches', 'plot_original_fans_blotches', 'plot_x_random_tiles_with_n_fans',
+__all__ = ['logger', 'FAN_PLOT_COLUMNS', 'BLOTCH_PLOT_COLUMNS', 'add_fans', 'add_blotches', 'plot_blotches_for_tile',
+           'plot_fans_for_tile', 'plot_original_tile', 'plot_original_and_fans', 'plot_original_and_blotches',
+           'plot_original_fans_blotches', 'plot_x_random_tiles_with_n_fans', 'render_tiles',
            'compute_direction_histogram', 'initialize_polar_axes', 'get_colorscale', 'histogram_polar',
            'histogram_cartesian', 'show_stamps']
 
 # %% ../notebooks/02_plotting.ipynb 2
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
 from matplotlib import pyplot as plt
 from matplotlib import colormaps
 import numpy as np
 import pandas as pd
 import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import EllipseCollection, LineCollection
+from matplotlib.figure import Figure
 from . import io, markings
 from numpy.typing import ArrayLike
 
+try:
+    from tqdm.auto import tqdm
+except ImportError:
+    tqdm = None
+
+logger = logging.getLogger(__name__)
+
 # %% ../notebooks/02_plotting.ipynb 3
-def plot_blotches_for_tile(tile_id, ax=None, **plot_kwargs):
+def add_fans(ax, fans, color="green", scope="planet4", alpha=0.65, **kwargs):
+    """Draw all `fans` as a single LineCollection of fan outlines.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw into.
+    fans : pandas.DataFrame
+        Fan marking data.
+    color : color or list of colors, optional
+        Color for all fans or one per fan.
+    scope : {'planet4', 'hirise'}
+        Coordinate scope, see `markings.Fan`.
+    **kwargs
+        Handed to `matplotlib.collections.LineCollection`.
+
+    Returns
+    -------
+    matplotlib.collections.LineCollection
+    """
+    outlines = markings.FanArray(fans, scope=scope).outlines()
+    collection = LineCollection(outlines, colors=color, alpha=alpha, **kwargs)
+    ax.add_collection(collection)
+    return collection
+
+
+def add_blotches(ax, blotches, color="green", scope="planet4", alpha=0.65, linewidth=2, **kwargs):
+    """Draw all `blotches` as a single EllipseCollection.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw into.
+    blotches : pandas.DataFrame
+        Blotch marking data.
+    color : color or list of colors, optional
+        Edge color for all blotches or one per blotch.
+    scope : {'planet4', 'hirise'}
+        Coordinate scope, see `markings.Blotch`.
+    **kwargs
+        Handed to `matplotlib.collections.EllipseCollection`.
+
+    Returns
+    -------
+    matplotlib.collections.EllipseCollection
+    """
+    blotch_array = markings.BlotchArray(blotches, scope=scope)
+    collection = EllipseCollection(
+        2 * blotch_array.radius_1,
+        2 * blotch_array.radius_2,
+        blotch_array.angle,
+        units="xy",
+        offsets=blotch_array.center,
+        offset_transform=ax.transData,
+        facecolors="none",
+        edgecolors=color,
+        linewidths=linewidth,
+        alpha=alpha,
+        **kwargs,
+    )
+    ax.add_collection(collection)
+    return collection
+
+# %% ../notebooks/02_plotting.ipynb 4
+def plot_blotches_for_tile(tile_id, ax=None, img=True, **plot_kwargs):
     tile_blotches = io.get_blotches_for_tile(tile_id)
     if ax is None:
         _, ax = plt.subplots()
-    for _, blotch in tile_blotches.iterrows():
-        m = markings.Blotch(blotch, with_center=False)
-        m.plot(ax=ax, **plot_kwargs)
+    if img:
+        markings.show_subframe(tile_id, ax=ax)
+    add_blotches(ax, tile_blotches, **plot_kwargs)
+    markings.set_subframe_size(ax)
 
-# %% ../notebooks/02_plotting.ipynb 6
-def plot_fans_for_tile(tile_id, ax=None, **plot_kwargs):
+# %% ../notebooks/02_plotting.ipynb 7
+def plot_fans_for_tile(tile_id, ax=None, img=True, **plot_kwargs):
     tile_fans = io.get_fans_for_tile(tile_id)
     if len(tile_fans) == 0:
         print("Warning: No fans found.")
     if ax is None:
         _, ax = plt.subplots()
-    for _, fan in tile_fans.iterrows():
-        m = markings.Fan(fan, with_center=False)
-        m.plot(ax=ax, **plot_kwargs)
+    if img:
+        markings.show_subframe(tile_id, ax=ax)
+    add_fans(ax, tile_fans, **plot_kwargs)
+    markings.set_subframe_size(ax)
 
-# %% ../notebooks/02_plotting.ipynb 9
+# %% ../notebooks/02_plotting.ipynb 10
 def plot_original_tile(tileID, ax=None):
     if ax is None:
         _, ax = plt.subplots()
     ax.imshow(io.get_subframe_by_tile_id(tileID), origin="upper", aspect="auto")
     ax.set_axis_off()
 
-# %% ../notebooks/02_plotting.ipynb 11
+# %% ../notebooks/02_plotting.ipynb 12
 def plot_original_and_fans(tileID):
     fig, axes = plt.subplots(ncols=2, figsize=(9, 3))
     plot_original_tile(tileID, ax=axes[0])
     plot_fans_for_tile(tileID, ax=axes[1])
     fig.suptitle(f"Planet Four tile ID: {tileID}")
 
-# %% ../notebooks/02_plotting.ipynb 13
+# %% ../notebooks/02_plotting.ipynb 14
 def plot_original_and_blotches(tileID):
     fig, axes = plt.subplots(ncols=2, figsize=(9, 3))
     plot_original_tile(tileID, ax=axes[0])
     plot_blotches_for_tile(tileID, ax=axes[1], color="magenta")
     fig.suptitle(f"Planet Four tile ID: {tileID}")
 
-# %% ../notebooks/02_plotting.ipynb 15
+# %% ../notebooks/02_plotting.ipynb 16
 def plot_original_fans_blotches(tileID, save=False):
     fig, axes = plt.subplots(ncols=2, figsize=(9, 3))
     plot_original_tile(tileID, ax=axes[0])
     plot_fans_for_tile(tileID, ax=axes[1])
-    plot_blotches_for_tile(tileID, ax=axes[1], color="magenta")
+    plot_blotches_for_tile(tileID, ax=axes[1], img=False, color="magenta")
     fig.suptitle(f"Planet Four tile ID: {tileID}")
     if save:
         fig.savefig(f"{tileID}.png", dpi=150)
 
-# %% ../notebooks/02_plotting.ipynb 18
+# %% ../notebooks/02_plotting.ipynb 19
 def plot_x_random_tiles_with_n_fans(
     x: int = 3,  # how many of 2 col original+p4 data plots to receive 
     n: int = 15,  # whats the minimum number of fans to contain
@@ -83,6 +165,152 @@ def plot_x_random_tiles_with_n_fans(
         plot_original_fans_blotches(tile_id, save=save)
 
 # %% ../notebooks/02_plotting.ipynb 20
+FAN_PLOT_COLUMNS = ["x", "y", "angle", "spread", "distance"]
+BLOTCH_PLOT_COLUMNS = ["x", "y", "angle", "radius_1", "radius_2"]
+
+
+class _TileFigure:
+    """Reusable Agg figure with the original tile and the tile with its markings.
+
+    Uses `Figure` and `FigureCanvasAgg` directly, bypassing the pyplot state machine,
+    and only swaps image data and marking collections between tiles.
+    """
+
+    def __init__(self, figsize=(9, 3)):
+        self.fig = Figure(figsize=figsize)
+        FigureCanvasAgg(self.fig)
+        self.axes = self.fig.subplots(ncols=2)
+        self.title = self.fig.suptitle("")
+        self.images = None
+        self.collections = []
+
+    def draw(self, tile_id, image, fans, blotches):
+        if self.images is None:
+            self.images = [ax.imshow(image, origin="upper", aspect="auto") for ax in self.axes]
+            for ax in self.axes:
+                ax.set_axis_off()
+        height, width = image.shape[:2]
+        for im in self.images:
+            im.set_data(image)
+            im.set_extent((-0.5, width - 0.5, height - 0.5, -0.5))
+        for ax in self.axes:
+            markings.set_subframe_size(ax)
+        for collection in self.collections:
+            collection.remove()
+        self.collections = [
+            add_fans(self.axes[1], fans),
+            add_blotches(self.axes[1], blotches, color="magenta"),
+        ]
+        self.title.set_text(f"Planet Four tile ID: {tile_id}")
+
+    def save(self, path, dpi):
+        self.fig.savefig(path, dpi=dpi)
+
+
+# one figure per worker process, re-used for all tiles it renders
+_tile_figure = None
+
+
+def _render_chunk(jobs, outdir, dpi):
+    "Render a list of (tile_id, url, fans, blotches) jobs. Returns (n_jobs, failed tile_ids)."
+    global _tile_figure
+    if _tile_figure is None:
+        _tile_figure = _TileFigure()
+    failed = []
+    for tile_id, url, fans, blotches in jobs:
+        try:
+            image = io.tile_image_store.get(tile_id, lambda: io.get_subframe(url))
+            _tile_figure.draw(tile_id, image, fans, blotches)
+            _tile_figure.save(Path(outdir) / f"{tile_id}.png", dpi)
+        except Exception:
+            logger.exception("Could not render tile %s.", tile_id)
+            failed.append(tile_id)
+    return len(jobs), failed
+
+
+def render_tiles(tile_ids, outdir, workers=4, chunksize=50, dpi=150, progressbar=True):
+    """Render quick-look PNGs (original tile + fans and blotches) for many tiles.
+
+    The marking catalogs are loaded once in the calling process; per-tile marking
+    data is streamed in chunks to a pool of worker processes that render with the
+    Agg backend into one re-used figure each.
+
+    Parameters
+    ----------
+    tile_ids : iterable of str
+        Planet Four tile_ids to render.
+    outdir : str or pathlib.Path
+        Folder for the `<tile_id>.png` files. Created if required.
+    workers : int, optional
+        Number of worker processes. With 1, everything runs in the calling process.
+    chunksize : int, optional
+        Number of tiles handed to a worker at once.
+    dpi : int, optional
+        Resolution of the saved figures.
+    progressbar : bool, optional
+        Show a tqdm progress bar with the current tile rate, if tqdm is installed.
+
+    Returns
+    -------
+    dict
+        Number of rendered tiles, failed tile_ids, elapsed seconds and tiles per second.
+    """
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    tile_ids = list(dict.fromkeys(tile_ids))
+    fan_index = io.get_tile_index("fans")
+    blotch_index = io.get_tile_index("blotches")
+
+    def url_for(tile_id):
+        try:
+            return io.get_url_for_tile_id(tile_id)
+        except KeyError:
+            # unknown tile, the worker will report it as failed
+            return None
+
+    def jobs_for(chunk):
+        return [(tile_id,
+                 url_for(tile_id),
+                 fan_index.get(tile_id)[FAN_PLOT_COLUMNS],
+                 blotch_index.get(tile_id)[BLOTCH_PLOT_COLUMNS])
+                for tile_id in chunk]
+
+    chunks = (tile_ids[i:i + chunksize] for i in range(0, len(tile_ids), chunksize))
+    pbar = tqdm(total=len(tile_ids), desc="Rendering tiles", unit="tile") if progressbar and tqdm is not None else None
+    n_done, failed = 0, []
+    start = time.perf_counter()
+
+    def collect(result):
+        nonlocal n_done
+        n_done += result[0]
+        failed.extend(result[1])
+        if pbar is not None:
+            pbar.update(result[0])
+
+    if workers <= 1:
+        for chunk in chunks:
+            collect(_render_chunk(jobs_for(chunk), outdir, dpi))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for chunk in chunks:
+                # keep only a few chunks in flight, so that marking data is streamed
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+                pending.add(executor.submit(_render_chunk, jobs_for(chunk), outdir, dpi))
+            for future in wait(pending).done:
+                collect(future.result())
+    if pbar is not None:
+        pbar.close()
+    elapsed = time.perf_counter() - start
+    rate = n_done / elapsed if elapsed > 0 else float("nan")
+    logger.info("Rendered %d of %d tiles in %.1f s (%.1f tiles/s).",
+                n_done - len(failed), len(tile_ids), elapsed, rate)
+    return dict(n_rendered=n_done - len(failed), failed=failed, seconds=elapsed, tiles_per_second=rate)
+
+# %% ../notebooks/02_plotting.ipynb 23
 def compute_direction_histogram(df, segmentsize, density=True, degrees=False):
     """
     Compute a histogram of direction angles adjusted by north azimuth.
@@ -371,7 +599,7 @@ def histogram_cartesian(df, ls_bin=4, segmentsize=3.6, alpha=0.5, degrees=True):
     return ax
 
 
-# %% ../notebooks/02_plotting.ipynb 25
+# %% ../notebooks/02_plotting.ipynb 28
 import geopandas as gpd 
 from typing import Optional,Union
 
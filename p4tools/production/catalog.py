@@ -2,14 +2,19 @@
 
 # %% auto 0
 __all__ = ['LOGGER', 'execute_in_parallel', 'fan_id_generator', 'blotch_id_generator', 'get_L1A_paths', 'cluster_obsid',
-           'fnotch_obsid', 'fnotch_obsid_parallel', 'cluster_obsid_parallel', 'add_marking_ids', 'create_roi_file',
-           'ReleaseManager', 'read_csvfiles_into_lists_of_frames']
+           'fnotch_obsid', 'fnotch_obsid_parallel', 'cluster_obsid_parallel', 'cluster_tiles_parallel',
+           'add_marking_ids', 'create_roi_file', 'ReleaseManager', 'read_csvfiles_into_lists_of_frames']
 
 # %% ../../notebooks/05_production.catalog.ipynb 2
 # other imports
 from tqdm.auto import tqdm
 import pandas as pd
 import logging
+import os
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
 import itertools
 from planetarypy.pds.apps import get_index
 import string
@@ -18,6 +23,7 @@ import numpy as np
 
 # p4tools package imports
 import p4tools.production.io as io
+from ..io import TileIndex
 import p4tools.production.metadata as p4meta
 from .projection import XY2LATLON, P4Mosaic, TileCalculator, create_RED45_mosaic
 
@@ -84,6 +90,10 @@ def blotch_id_generator() -> Generator[str, Any, None]:
 def get_L1A_paths(obsid, savefolder):
     """
     Retrieve L1A observation paths for a given observation ID.
+
+    These are the L1A folders of its image_ids and, for `l1a_format='parquet'`
+    clustering results, the obsid's L1A dataset.
+
     Parameters
     ----------
     obsid : str
@@ -97,6 +107,8 @@ def get_L1A_paths(obsid, savefolder):
     """
     pm = io.PathManager(obsid=obsid, datapath=savefolder)
     paths = pm.get_obsid_paths("L1A")
+    if pm.L1A_dataset.exists():
+        paths.append(pm.L1A_dataset)
     return paths
 
 # %% ../../notebooks/05_production.catalog.ipynb 6
@@ -140,7 +152,8 @@ def fnotch_obsid(obsid=None, savedir=None, fnotch_via_obsid=False, imgid=None):
         The directory where the results will be saved.
     fnotch_via_obsid : bool, optional
         Switch to control if fnotching happens per observation ID (obsid) or per image ID.
-        If True, fnotching is done per observation ID. If False, fnotching is done per image ID.
+        If True, fnotching is done per observation ID, across tile borders in HiRISE
+        coordinates. If False, fnotching is done per image ID.
     imgid : str, optional
         The image ID to be processed. This parameter is currently not used in the function.
 
@@ -152,9 +165,8 @@ def fnotch_obsid(obsid=None, savedir=None, fnotch_via_obsid=False, imgid=None):
     from p4tools.production import fnotching
 
     # fnotching / combining ambiguous cluster results
-    # fnotch across all the HiRISE image
-    # does not work yet correctly! Needs to scale for n_classifications
     if fnotch_via_obsid is True:
+        # fnotch across all the HiRISE image
         fnotching.fnotch_obsid(obsid, savedir=savedir)
         fnotching.apply_cut_obsid(obsid, savedir=savedir)
     else:
@@ -197,19 +209,247 @@ def cluster_obsid_parallel(obsids : list[str], savedir : str, dbname : str):
         lazys.append(delayed(cluster_obsid)(obsid, savedir, dbname=dbname))
     return compute(*lazys)
 
+# %% ../../notebooks/05_production.catalog.ipynb 8
+# per worker process: the attached shared marking table and a reusable DBScanner
+_worker_state = {}
 
 
-# %% ../../notebooks/05_production.catalog.ipynb 8
+def _share_markings(data):
+    """Copy the columns needed for clustering of `data` into one shared memory block.
+
+    Numeric columns are stored as float64 rows of a (n_columns, n_markings) array,
+    `marking` and `classification_id` as their factorized codes.
+
+    Returns
+    -------
+    tuple(multiprocessing.shared_memory.SharedMemory, dict)
+        The block (to be closed and unlinked by the caller) and the spec workers use
+        to attach to it.
+    """
+    numeric = list(data.select_dtypes(include=["number", "bool"]).columns)
+    marking_codes, marking_names = pd.factorize(data["marking"])
+    class_codes, class_ids = pd.factorize(data["classification_id"])
+    shape = (len(numeric) + 2, len(data))
+    shm = shared_memory.SharedMemory(create=True, size=max(8, 8 * shape[0] * shape[1]))
+    block = np.ndarray(shape, dtype="float64", buffer=shm.buf)
+    for i, col in enumerate(numeric):
+        block[i] = data[col].to_numpy(dtype="float", na_value=np.nan)
+    block[-2] = marking_codes
+    block[-1] = class_codes
+    spec = dict(
+        name=shm.name,
+        shape=shape,
+        columns=numeric,
+        markings=list(marking_names),
+        n_classifications=len(class_ids),
+    )
+    return shm, spec
+
+
+def _attach_markings(spec, scanner_kwargs):
+    "Worker initializer: attach to the shared marking table and set up a DBScanner."
+    from p4tools.production import dbscan
+
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    _worker_state["shm"] = shm
+    _worker_state["block"] = np.ndarray(spec["shape"], dtype="float64", buffer=shm.buf)
+    _worker_state["spec"] = spec
+    _worker_state["scanner"] = dbscan.DBScanner(save_results=False, **scanner_kwargs)
+
+
+def _tile_frame(start, stop):
+    "Rebuild the marking table of one tile from the shared block."
+    block, spec = _worker_state["block"], _worker_state["spec"]
+    frame = pd.DataFrame(block[:-2, start:stop].T, columns=spec["columns"])
+    frame["marking"] = pd.Categorical.from_codes(
+        block[-2, start:stop].astype("int"), spec["markings"]
+    )
+    frame["classification_id"] = pd.Categorical.from_codes(
+        block[-1, start:stop].astype("int"), pd.RangeIndex(spec["n_classifications"])
+    )
+    return frame
+
+
+def _cluster_tile_batch(tiles):
+    """Cluster a batch of tiles in a worker process.
+
+    Returns a list of (image_id, obsid, min_samples, reduced_data) per tile.
+    """
+    from p4tools.production import markings
+
+    scanner = _worker_state["scanner"]
+    results = []
+    for image_id, obsid, start, stop in tiles:
+        scanner.noise = []
+        scanner.p4id = markings.TileID(
+            image_id, scope="p4tools", data=_tile_frame(start, stop), image_name=obsid
+        )
+        scanner.cluster_markings()
+        results.append((image_id, obsid, scanner.min_samples, scanner.reduced_data))
+    return results
+
+
+def _balanced_batches(tiles, counts, n_workers):
+    """Group tiles into batches of similar marking counts, largest first.
+
+    Large tiles end up alone in a batch, small ones are bundled so that per-task overhead
+    stays low while the pool can still balance the tail of the work.
+    """
+    order = np.argsort(counts, kind="stable")[::-1]
+    target = max(1, counts.sum() / (16 * n_workers))
+    batches, batch, size = [], [], 0
+    for i in order:
+        batch.append(tiles[i])
+        size += counts[i]
+        if size >= target:
+            batches.append(batch)
+            batch, size = [], 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def cluster_tiles_parallel(
+    obsids : list[str],
+    savedir : str,
+    dbname : str = None,
+    workers : int = None,
+    data : DataFrame = None,
+    **scanner_kwargs,
+):
+    """Cluster all tiles of `obsids` in a pool of worker processes.
+
+    The marking table is read once and put into shared memory, sorted by image_id, so
+    that workers cluster tiles from it without reading the database or pickling markings.
+    Tiles are scheduled largest first, balanced by their number of markings. All L1A
+    output is written by this (the parent) process, so there is only one writer. CSV
+    results get one `clustering_settings.yaml` per obsid, with the min_samples of each
+    tile, as in the fast mode of `DBScanner`.
+
+    Parameters
+    ----------
+    obsids : list[str]
+        List of the obsids to cluster
+    savedir : str
+        path to the save directory which will save the clustering results
+    dbname : str, optional
+        The Parquet database, of which only the markings of `obsids` are read. Not
+        used if `data` is given.
+    workers : int, optional
+        Number of worker processes. Default: `os.cpu_count()`
+    data : pandas.DataFrame, optional
+        Marking data of `obsids`, if already loaded.
+    **scanner_kwargs
+        Passed on to `DBScanner`, e.g. `msf`.
+
+    Returns
+    -------
+    list[str]
+        The clustered obsids.
+    """
+    from p4tools.production import dbscan, markings
+
+    if scanner_kwargs.get("global_clustering"):
+        raise ValueError("Tiles are not clustered on their own with global_clustering.")
+    workers = os.cpu_count() if workers is None else workers
+    t0 = time.perf_counter()
+    if data is None:
+        data = pd.read_parquet(dbname, filters=[("image_name", "in", list(obsids))])
+    else:
+        data = data[data.image_name.isin(obsids)]
+    index = TileIndex(data, column="image_id")
+    data = data.take(index.order)
+    starts = np.array([start for start, _ in index.offsets.values()], dtype="int")
+    stops = np.array([stop for _, stop in index.offsets.values()], dtype="int")
+    tile_obsids = data["image_name"].to_numpy()[starts] if len(starts) else []
+    tiles = list(zip(index.offsets, tile_obsids, starts.tolist(), stops.tolist()))
+
+    writer = dbscan.DBScanner(savedir=savedir, dbname=dbname, **scanner_kwargs)
+    settings = writer.clustering_settings()
+    # one L1A dataset writer per obsid if results are stored as Parquet
+    datasets = {}
+    if writer.l1a_format == "parquet":
+        for obsid in dict.fromkeys(tile_obsids):
+            writer.pm.obsid = obsid
+            datasets[obsid] = io.L1AWriter(
+                writer.pm.L1A_dataset, settings, keep_previous=writer.incremental
+            )
+    # fingerprints are computed here, where the original classification_ids are known
+    fingerprints = {}
+    run_min_samples = {obsid: {} for obsid in dict.fromkeys(tile_obsids)}
+    todo = []
+    for tile in tiles:
+        image_id, obsid, start, stop = tile
+        writer.pm.obsid = obsid
+        writer.pm.id = image_id
+        fingerprints[image_id] = dbscan.tile_fingerprint(data.iloc[start:stop], settings)
+        if writer.incremental and writer.is_unchanged(fingerprints[image_id], datasets.get(obsid)):
+            if obsid in datasets:
+                datasets[obsid].carry_over(image_id)
+            else:
+                # keep the unchanged tile in the run settings file
+                writer.p4id = markings.TileID(
+                    image_id, scope="p4tools", data=data.iloc[start:stop], image_name=obsid
+                )
+                run_min_samples[obsid][image_id] = writer.min_samples
+            continue
+        todo.append(tile)
+    if len(todo) < len(tiles):
+        LOGGER.info("Skipping %i unchanged tiles.", len(tiles) - len(todo))
+    tiles = todo
+    batches = _balanced_batches(tiles, np.array([stop - start for *_, start, stop in tiles]), workers)
+    LOGGER.info(
+        "Clustering %i tiles of %i obsids in %i batches on %i workers.",
+        len(tiles), len(obsids), len(batches), workers,
+    )
+    shm, spec = _share_markings(data)
+    try:
+        with ProcessPoolExecutor(
+            workers, initializer=_attach_markings, initargs=(spec, dict(savedir=savedir, **scanner_kwargs))
+        ) as executor:
+            futures = [executor.submit(_cluster_tile_batch, batch) for batch in batches]
+            with tqdm(total=len(tiles), desc="Clustering tiles") as pbar:
+                for future in as_completed(futures):
+                    for image_id, obsid, min_samples, reduced_data in future.result():
+                        writer.pm.obsid = obsid
+                        writer.pm.id = image_id
+                        run_min_samples[obsid][image_id] = min_samples
+                        writer.store_tile_results(
+                            reduced_data, fingerprints[image_id], datasets.get(obsid), min_samples
+                        )
+                        pbar.update()
+        for dataset in datasets.values():
+            dataset.close()
+        if writer.l1a_format == "csv":
+            for obsid, min_samples in run_min_samples.items():
+                writer.pm.obsid = obsid
+                writer.write_run_settings_file(writer.eps_values, dict(sorted(min_samples.items())))
+    finally:
+        shm.close()
+        shm.unlink()
+    LOGGER.info("Clustered %i tiles in %.1f s.", len(tiles), time.perf_counter() - t0)
+    return list(obsids)
+
+# %% ../../notebooks/05_production.catalog.ipynb 9
 def add_marking_ids(path, fan_id, blotch_id):
     """Add marking_ids for catalog to cluster results.
 
     Parameters
     ----------
     path : str, pathlib.Path
-        Path to L1A image_id clustering result directory
+        Path to L1A image_id clustering result directory, or to an obsid's L1A
+        Parquet dataset.
     fan_id, blotch_id : generator
         Generator for marking_id
     """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        for kind, id_ in zip(["fan", "blotch"], [fan_id, blotch_id]):
+            for partpath in sorted(path.glob(f"kind={kind}/*.parquet")):
+                df = pd.read_parquet(partpath)
+                df["marking_id"] = [next(id_) for _ in range(df.shape[0])]
+                df.to_parquet(partpath, index=False)
+        return
     image_id = path.parent.name
     for kind, id_ in zip(["fans", "blotches"], [fan_id, blotch_id]):
         fname = str(path / f"{image_id}_L1A_{kind}.csv")
@@ -224,8 +464,8 @@ def add_marking_ids(path, fan_id, blotch_id):
             df["marking_id"] = marking_ids
             df.to_csv(fname, index=False)
 
-# %% ../../notebooks/05_production.catalog.ipynb 9
-def create_roi_file(obsids, roi_name, datapath):
+# %% ../../notebooks/05_production.catalog.ipynb 10
+def create_roi_file(obsids, roi_name, datapath, cut=0.5):
     """Create a Region of Interest file, based on list of obsids.
 
     For more structured analysis processes, we can create a summary file for a list of obsids
@@ -241,12 +481,21 @@ def create_roi_file(obsids, roi_name, datapath):
         Name for ROI
     datapath : str or pathlib.Path
         Path to the top folder with the clustering output data.
+    cut : float, optional
+        Cut value of the L1C data to collect, see `fnotching.apply_cuts`. Default: 0.5
     """
     Bucket = dict(fan=[], blotch=[])
     for obsid in tqdm(obsids):
-        pm = io.PathManager(obsid=obsid, datapath=datapath)
-        # get all L1C folders for current obsid:
-        folders = pm.get_obsid_paths("L1C")
+        pm = io.PathManager(obsid=obsid, datapath=datapath, cut=cut)
+        # get the L1C folders of `cut` of all tiles of the current obsid, or its L1C
+        # folder if it was fnotched as a whole:
+        obsid_folder = pm.path_so_far / pm.L1C_folder
+        if obsid_folder.is_dir():
+            folders = [obsid_folder]
+        else:
+            folders = [
+                p / pm.L1C_folder for p in sorted(pm.path_so_far.glob("*")) if (p / pm.L1C_folder).is_dir()
+            ]
         bucket = read_csvfiles_into_lists_of_frames(folders)
         for key, val in bucket.items():
             try:
@@ -277,8 +526,7 @@ def create_roi_file(obsids, roi_name, datapath):
             df.to_csv(savepath, index=False, float_format="%.2f")
             print(f"Created {savepath}.")
 
-
-# %% ../../notebooks/05_production.catalog.ipynb 10
+# %% ../../notebooks/05_production.catalog.ipynb 11
 class ReleaseManager:
     """Class to manage releases and find relevant files.
     TODO better description
@@ -943,7 +1191,7 @@ class ReleaseManager:
                 temp_obsids = self.obsids[parallel_tasks*i:]
 
             LOGGER.info(f"Performing the Clustering for batch {i}")
-            _ = cluster_obsid_parallel(temp_obsids, self.catalog, self.dbname)
+            _ = cluster_tiles_parallel(temp_obsids, self.catalog, self.dbname)
 
             for obsid in temp_obsids:
                 paths = get_L1A_paths(obsid, self.catalog)
@@ -1045,9 +1293,7 @@ class ReleaseManager:
         
         self.mark_done(obsid)
 
-
-
-# %% ../../notebooks/05_production.catalog.ipynb 11
+# %% ../../notebooks/05_production.catalog.ipynb 12
 def read_csvfiles_into_lists_of_frames(folders):
     """
     Reads CSV files from given folders into lists of DataFrames.
@@ -1,19 +1,27 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../notebooks/05e_production.dbscan.ipynb.
 
 # %% auto 0
-__all__ = ['logger', 'get_average_objects', 'plot_results', 'DBScanner']
+__all__ = ['logger', 'average_clusters', 'get_average_objects', 'plot_results', 'assign_home_tiles', 'tile_fingerprint',
+           'grid_dbscan', 'DBScanner', 'scan_parameters', 'plot_parameter_scan']
 
 # %% ../../notebooks/05e_production.dbscan.ipynb 2
 from . import io,markings
+from ..io import TileIndex
 
 
 from sklearn.cluster import DBSCAN
+from sklearn.neighbors import radius_neighbors_graph
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from itertools import product
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy.stats import circmean, circstd
 import pyaml
 from pathlib import Path
+from collections import Counter
+import hashlib
+import json
 import logging
 import pandas as pd
 from tqdm.auto import tqdm
@@ -21,6 +29,80 @@ from tqdm.auto import tqdm
 logger = logging.getLogger(__name__)
 
 # %% ../../notebooks/05e_production.dbscan.ipynb 3
+def _grouped_mean_std(values, labels, n):
+    """Return NaN-skipping mean and sample std per label for the columns of `values`.
+
+    All columns and groups are reduced together with one flattened `np.bincount`.
+    """
+    ncols = values.shape[1]
+    flat = (labels[:, None] * ncols + np.arange(ncols)).ravel()
+    valid = ~np.isnan(values)
+
+    def group_sum(weights):
+        sums = np.bincount(flat, weights=weights.ravel(), minlength=n * ncols)
+        return sums.reshape(n, ncols)
+
+    counts = group_sum(valid.astype("float"))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = group_sum(np.where(valid, values, 0)) / counts
+        dev = np.where(valid, values - mean[labels], 0)
+        std = np.sqrt(group_sum(dev * dev) / (counts - 1))
+    mean[counts == 0] = np.nan
+    std[counts < 2] = np.nan
+    return mean, std
+
+
+def average_clusters(data, labels, kind):
+    """Create the average objects of all clusters in `data` in one vectorized pass.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        table with rows of markings (fans or blotches) to be averaged
+    labels : array-like of int
+        Cluster label per row of `data`. Rows with a negative label (noise) are ignored.
+    kind : {'fan', 'blotch}
+        Switch to control the circularity for the average angle calculation.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per cluster, in order of the labels, with the same columns as the
+        frames from `get_average_objects`.
+    """
+    labels = np.asarray(labels)
+    member = labels >= 0
+    clusters, labels = np.unique(labels[member], return_inverse=True)
+    n = len(clusters)
+    logger.debug("Averaging %i clusters with kind = %s.", n, kind)
+    numeric = data.select_dtypes(include=["number", "bool"])
+    values = numeric.to_numpy(dtype="float", na_value=np.nan)[member]
+    mean, std = _grouped_mean_std(values, labels, n)
+    averaged = pd.DataFrame(mean, columns=numeric.columns)
+    std = pd.DataFrame(std, columns=numeric.columns)
+
+    # circular mean and std via the summed unit vectors of the angles
+    # this determines the upper limit for circular mean
+    high = 180 if kind == "blotch" else 360
+    angles = data["angle"].to_numpy(dtype="float")[member] * (2 * np.pi / high)
+    sin_sum = np.bincount(labels, weights=np.sin(angles), minlength=n)
+    cos_sum = np.bincount(labels, weights=np.cos(angles), minlength=n)
+    n_votes = np.bincount(labels, minlength=n).astype("float")
+    averaged["angle"] = (np.arctan2(sin_sum, cos_sum) * (high / (2 * np.pi))) % high
+    resultant = np.clip(np.hypot(sin_sum / n_votes, cos_sum / n_votes), None, 1)
+    averaged["angle_std"] = (np.sqrt(-2 * np.log(resultant)) + 0.0) * (high / (2 * np.pi))
+    averaged["n_votes"] = n_votes
+    averaged["x_std"] = std["x"]
+    averaged["y_std"] = std["y"]
+    if kind == "fan":
+        averaged["distance_std"] = std["distance"]
+        averaged["spread_std"] = std["spread"]
+    elif kind == 'blotch':
+        averaged["radius1_std"] = std["radius_1"]
+        averaged["radius2_std"] = std["radius_2"]
+    return averaged
+
+
 def get_average_objects(clusters, kind):
     """Create the average object out of a sequence of clusters.
 
@@ -34,32 +116,18 @@ def get_average_objects(clusters, kind):
     Returns
     -------
     Generator providing single row pandas.DataFrames with the average values
-    """
-    logger.debug("Averaging clusters with kind = %s.", kind)
-    for cluster_df in clusters:
-        # first filter for outliers more than 1 std away
-        # for
-        # reduced = df[df.apply(lambda x: np.abs(x - x.mean()) / x.std() < 1).all(axis=1)]
-        logger.debug("Averaging %i objects.", len(cluster_df))
-        logger.debug("x.mean: %f", cluster_df.x.mean())
-        logger.debug("y.mean: %f", cluster_df.y.mean())
-        meandata = cluster_df.mean(numeric_only=True)
-        # this determines the upper limit for circular mean
-        high = 180 if kind == "blotch" else 360
-        meandata.angle = circmean(cluster_df.angle, high=high)
-        meandata["angle_std"] = circstd(cluster_df.angle, high=high)
-        meandata["n_votes"] = len(cluster_df)
-        meandata["x_std"] = cluster_df.x.std()
-        meandata["y_std"] = cluster_df.y.std()
-        if kind == "fan":
-            meandata["distance_std"] = cluster_df.distance.std()
-            meandata["spread_std"] = cluster_df.spread.std()
-        elif kind == 'blotch':
-            meandata["radius1_std"] = cluster_df.radius_1.std()
-            meandata["radius2_std"] = cluster_df.radius_2.std()
-
-        yield meandata.to_frame().T
 
+    See also
+    --------
+    average_clusters : Same averaging for clusters given as label array.
+    """
+    clusters = list(clusters)
+    if not clusters:
+        return
+    labels = np.repeat(np.arange(len(clusters)), [len(df) for df in clusters])
+    averaged = average_clusters(pd.concat(clusters), labels, kind)
+    for i in range(len(averaged)):
+        yield averaged.iloc[[i]].reset_index(drop=True)
 
 
 def plot_results(p4id, labels, data=None, kind=None, reduced_data=None, ax=None):
@@ -100,6 +168,219 @@ def plot_results(p4id, labels, data=None, kind=None, reduced_data=None, ax=None)
         functions[kind](ax=ax, data=reduced_data, lw=1, with_center=True)
 
 # %% ../../notebooks/05e_production.dbscan.ipynb 4
+def assign_home_tiles(data, labels, averaged):
+    """Assign the clusters of an obsid-wide clustering to their home tiles.
+
+    The home tile of a cluster is the tile with most of its markings. The cluster's
+    x, y, which are averaged in HiRISE image coordinates, are converted to the tile
+    coordinates of the home tile, so that the clusters can be stored and processed
+    per tile like the ones of a tile-wise clustering.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The clustered markings, with tile and HiRISE image coordinates.
+    labels : np.ndarray
+        Cluster label per row of `data`, from 0 to the number of clusters - 1.
+    averaged : pandas.DataFrame
+        Output of `average_clusters` on `data` and `labels`, with x, y averaged from
+        image_x, image_y. Changed in place.
+    """
+    codes, tiles = pd.factorize(data["image_id"])
+    # votes per cluster and tile; the tile with most votes wins, the first on a tie
+    keys, votes = np.unique(labels * len(tiles) + codes, return_counts=True)
+    cluster, tile = np.divmod(keys, len(tiles))
+    order = np.lexsort((tile, -votes, cluster))
+    is_first = np.r_[True, cluster[order][1:] != cluster[order][:-1]]
+    home = tile[order][is_first]
+    # tile offsets in the HiRISE image, from the first marking of every tile
+    _, first = np.unique(codes, return_index=True)
+    for col in ["x", "y"]:
+        offsets = (data[f"image_{col}"] - data[col]).to_numpy()[first]
+        averaged[col] = averaged[f"image_{col}"] - offsets[home]
+        averaged[f"{col}_tile"] = data[f"{col}_tile"].to_numpy()[first][home]
+    averaged["image_id"] = np.asarray(tiles)[home]
+
+# %% ../../notebooks/05e_production.dbscan.ipynb 5
+def tile_fingerprint(data, settings):
+    """Return a fingerprint of the clustering inputs of one tile.
+
+    It hashes the set of classification_ids in the tile's marking `data` together with
+    the clustering `settings`, so it changes when new classifications arrive or when
+    clustering parameters change.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Marking data of one tile.
+    settings : dict
+        Clustering settings, see `DBScanner.clustering_settings`.
+
+    Returns
+    -------
+    str
+        Hex digest of the fingerprint.
+    """
+    digest = hashlib.sha1(json.dumps(settings, sort_keys=True, default=str).encode())
+    classification_ids = np.sort(data["classification_id"].unique().astype("str"))
+    digest.update("\n".join(classification_ids).encode())
+    return digest.hexdigest()
+
+# %% ../../notebooks/05e_production.dbscan.ipynb 6
+def _grid_neighbor_pairs(X, eps):
+    """Return all pairs `(i, j)`, `i != j`, of rows of the 2-column `X` within `eps`.
+
+    The points are bucketed into a uniform grid of `eps` sized cells and sorted by cell,
+    row by row, so the candidates of a point are the points of 2 contiguous runs of
+    cells: the rest of its own row of 3 cells and the 3 cells in the next row. Each pair
+    is returned once.
+    """
+    n = len(X)
+    cells = np.floor((X - X.min(axis=0)) / eps).astype("int64")
+    n_cols = cells[:, 0].max() + 3
+    cell_ids = (cells[:, 1] + 1) * n_cols + cells[:, 0] + 1
+    order = np.argsort(cell_ids, kind="stable")
+    cell_ids = cell_ids[order]
+    X = X[order]
+    first, second = [], []
+    for row_offset in (0, n_cols):
+        stop = np.searchsorted(cell_ids, cell_ids + row_offset + 1, side="right")
+        if row_offset == 0:
+            start = np.arange(1, n + 1)
+        else:
+            start = np.searchsorted(cell_ids, cell_ids + row_offset - 1, side="left")
+        counts = np.maximum(stop - start, 0)
+        i = np.repeat(np.arange(n), counts)
+        j = np.arange(counts.sum()) + np.repeat(start - (np.cumsum(counts) - counts), counts)
+        diff = X[i] - X[j]
+        # squared distances, compared like sklearn's tree neighbor searches do
+        within = diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1] <= eps * eps
+        first.append(order[i[within]])
+        second.append(order[j[within]])
+    return np.concatenate(first), np.concatenate(second)
+
+
+def _chunks(X, eps, chunk_size=None):
+    """Split the rows of `X` into chunks of at most `chunk_size` rows plus their halo.
+
+    The chunks are strips along the longer axis of `X`. The halo of a chunk are the rows
+    of its neighboring strips that are closer than `eps` to its borders, so all
+    neighbors of a chunk's own rows are part of the chunk.
+
+    Yields
+    ------
+    members : np.ndarray
+        Row indices of the chunk, its own rows first, then its halo.
+    n_own : int
+        Number of own rows in `members`.
+    """
+    n = len(X)
+    if chunk_size is None or n <= chunk_size:
+        yield np.arange(n), n
+        return
+    axis = np.argmax(np.ptp(X, axis=0))
+    order = np.argsort(X[:, axis], kind="stable")
+    coords = X[order, axis]
+    # a little margin against rounding at the halo borders
+    halo = eps * 1.001
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        left = np.searchsorted(coords, coords[start] - halo, side="left")
+        right = np.searchsorted(coords, coords[stop - 1] + halo, side="right")
+        members = np.concatenate([order[start:stop], order[left:start], order[stop:right]])
+        yield members, stop - start
+
+
+def grid_dbscan(X, eps, min_samples, chunk_size=None):
+    """DBSCAN for 2D points, with a uniform-grid neighbor index.
+
+    Meant for x, y coordinates of dense tiles, whose small fixed extent keeps the
+    grid small, and with `chunk_size` for the markings of whole obsids. Gives the same
+    labels and core samples as `DBSCAN(eps, min_samples=min_samples).fit(X)`: clusters
+    are the connected components of the core samples, numbered in order of their first
+    core sample, and border samples join the lowest numbered cluster they are a
+    neighbor of.
+
+    With `chunk_size`, the points are processed in strips of at most `chunk_size` points
+    plus a halo of `eps` width (see `_chunks`), in two passes: first the core samples
+    are determined, then the clusters within each strip are connected. Clusters that
+    cross strip borders are stitched together via the core samples they share with
+    the halo.
+
+    Parameters
+    ----------
+    X : array-like, shape (n_samples, 2)
+        The points to cluster.
+    eps : float
+        Maximum distance of two points to be neighbors.
+    min_samples : int
+        Number of neighbors, including the point itself, that make a core sample.
+    chunk_size : int, optional
+        Maximum number of points per strip, bounding the memory use. Default: all.
+
+    Returns
+    -------
+    labels : np.ndarray
+        Cluster label per point, -1 for noise.
+    core_sample_indices : np.ndarray
+        Indices of the core samples.
+    """
+    X = np.asarray(X, dtype="float64")
+    n = len(X)
+    labels = np.full(n, -1, dtype="int64")
+    if n == 0:
+        return labels, np.flatnonzero(labels)
+    chunks = list(_chunks(X, eps, chunk_size))
+    # with a single chunk, the neighbor pairs are only searched once
+    pairs = {}
+    n_neighbors = np.ones(n, dtype="int64")
+    for i, (members, n_own) in enumerate(chunks):
+        first, second = _grid_neighbor_pairs(X[members], eps)
+        if len(chunks) == 1:
+            pairs[i] = first, second
+        counts = np.bincount(first, minlength=len(members)) + np.bincount(second, minlength=len(members))
+        n_neighbors[members[:n_own]] += counts[:n_own]
+    core = n_neighbors >= min_samples
+    core_sample_indices = np.flatnonzero(core)
+
+    # every core sample gets linked to the first core sample of its cluster within each
+    # chunk it is part of; the links of the halos stitch the clusters of all chunks
+    links, border_links = [], []
+    for i, (members, n_own) in enumerate(chunks):
+        first, second = pairs.pop(i) if i in pairs else _grid_neighbor_pairs(X[members], eps)
+        is_core = core[members]
+        linked = is_core[first] & is_core[second]
+        local = sparse.csr_matrix(
+            (np.ones(np.count_nonzero(linked), dtype="int8"), (first[linked], second[linked])),
+            shape=(len(members), len(members)),
+        )
+        _, components = connected_components(local, directed=False)
+        _, representatives = np.unique(components, return_index=True)
+        local_core = np.flatnonzero(is_core)
+        links.append(members[[local_core, representatives[components[local_core]]]])
+        for point, neighbor in [(first, second), (second, first)]:
+            mask = (point < n_own) & ~is_core[point] & is_core[neighbor]
+            border_links.append(members[[point[mask], neighbor[mask]]])
+    links = np.concatenate(links, axis=1)
+    graph = sparse.csr_matrix(
+        (np.ones(links.shape[1], dtype="int8"), (links[0], links[1])), shape=(n, n)
+    )
+    n_components, components = connected_components(graph, directed=False)
+    core_components = components[core_sample_indices]
+    # core_sample_indices is sorted, so np.unique returns each component's first core sample
+    _, first_core = np.unique(core_components, return_index=True)
+    cluster_numbers = np.empty(n_components, dtype="int64")
+    cluster_numbers[core_components[np.sort(first_core)]] = np.arange(len(first_core))
+    labels[core_sample_indices] = cluster_numbers[core_components]
+
+    point, neighbor = np.concatenate(border_links, axis=1)
+    border = np.full(n, np.iinfo("int64").max)
+    np.minimum.at(border, point, labels[neighbor])
+    is_border = border < np.iinfo("int64").max
+    labels[is_border] = border[is_border]
+    return labels, core_sample_indices
+
+# %% ../../notebooks/05e_production.dbscan.ipynb 7
 class DBScanner:
     """
 
@@ -117,6 +398,26 @@ class DBScanner:
         be done.
     save_results : bool
         Switch to control if the resulting clustered objects should be written to disk.
+    l1a_format : {'csv', 'parquet'}
+        Storage of the L1A results: CSV and settings files per image_id, or one Parquet
+        dataset per obsid with the settings as metadata (see `io.L1AWriter`).
+    incremental : bool
+        Skip tiles whose classifications and clustering settings did not change since
+        their stored L1A results, based on the `tile_fingerprint` stored with them.
+    grid_index : bool
+        Use `grid_dbscan`, with a uniform-grid neighbor index, for the x, y clustering.
+        It gives the same clusters as sklearn's DBSCAN and is faster on dense tiles.
+    global_clustering : bool
+        Cluster all markings of an obsid together in HiRISE image coordinates instead of
+        per tile, see `cluster_obsid_global`.
+    chunk_size : int
+        Maximum number of markings per strip of the obsid-wide x, y clustering, which
+        bounds its memory use.
+    fast_mode : bool
+        Production mode for large runs: the logfile is set up once per process, CSV
+        settings are written once per `cluster_image_name` run instead of per tile, and
+        per-cluster debug logging is replaced by `self.counters`, which are logged at the
+        end of each run.
     """
 
     def __init__(
@@ -130,6 +431,12 @@ class DBScanner:
         only_core_samples=False,
         data=None,
         dbname=None,
+        l1a_format="csv",
+        incremental=False,
+        grid_index=False,
+        global_clustering=False,
+        chunk_size=100_000,
+        fast_mode=False,
     ):
         self.msf = msf
         self.savedir = savedir
@@ -142,6 +449,17 @@ class DBScanner:
         self.pm = io.PathManager(datapath=savedir)
         self.noise = []
         self.dbname = dbname
+        self.l1a_format = l1a_format
+        self.incremental = incremental
+        self.grid_index = grid_index
+        self.global_clustering = global_clustering
+        self.chunk_size = chunk_size
+        self.fast_mode = fast_mode
+        self.counters = Counter()
+        self._logfiles_ready = False
+        # min_samples per tile of the current fast mode run
+        self._run_min_samples = None
+        self._min_samples_cache = (None, None, None)
 
         # This needs to be on instance level, so that a new object always has these default numbers
         # It sets all the different eps values for the different clustering loops here:
@@ -177,7 +495,7 @@ class DBScanner:
         p4id = markings.TileID(id_)
         p4id.plot_all()
 
-    def cluster_any(self, X, eps):
+    def cluster_any(self, X, eps, grid=False, chunk_size=None):
         """
         Perform DBSCAN clustering on the given data.
 
@@ -187,7 +505,11 @@ class DBScanner:
             The input data to be clustered.
         eps : float
             The maximum distance between two samples for one to be considered as in the neighborhood of the other.
-            
+        grid : bool
+            Use `grid_dbscan` instead of sklearn's DBSCAN. Only for 2 features.
+        chunk_size : int, optional
+            Maximum number of points per strip for `grid_dbscan`.
+
         Yields
         ------
         indices : array-like, shape (n_samples,)
@@ -195,15 +517,23 @@ class DBScanner:
         """
 
         logger.debug("Clustering any.")
-        db = DBSCAN(eps, min_samples=self.min_samples).fit(X)
-        labels = db.labels_
+        if grid:
+            labels, core_sample_indices = grid_dbscan(X, eps, self.min_samples, chunk_size)
+        else:
+            db = DBSCAN(eps, min_samples=self.min_samples).fit(X)
+            labels, core_sample_indices = db.labels_, db.core_sample_indices_
         unique_labels = sorted(set(labels))
 
         core_samples_mask = np.zeros_like(labels, dtype=bool)
-        core_samples_mask[db.core_sample_indices_] = True
+        core_samples_mask[core_sample_indices] = True
 
         self.n_clusters = len(unique_labels) - (1 if -1 in labels else 0)
-        logger.debug("%i cluster(s) found with:", self.n_clusters)
+        if self.fast_mode:
+            self.counters["dbscan_fits"] += 1
+            self.counters["clusters"] += self.n_clusters
+            self.counters["noise_points"] += int(np.count_nonzero(labels == -1))
+        else:
+            logger.debug("%i cluster(s) found with:", self.n_clusters)
 
         self.labels = labels
 
@@ -211,7 +541,8 @@ class DBScanner:
         for k in unique_labels:
             class_member_mask = (labels == k)
             if k == -1:
-                self.noise.append(class_member_mask)
+                if not self.fast_mode:
+                    self.noise.append(class_member_mask)
                 continue
             if self.only_core_samples is True:
                 # this has a potentially large effect and can make the number
@@ -219,15 +550,21 @@ class DBScanner:
                 indices = class_member_mask & core_samples_mask
             else:
                 indices = class_member_mask
-            logger.debug("%i members.", np.count_nonzero(indices))
+            if not self.fast_mode:
+                logger.debug("%i members.", np.count_nonzero(indices))
             yield indices
 
     def cluster_xy(self, data, eps):
         logger.info("Clustering x,y with eps: %i", eps)
         X = data[["x", "y"]].values
-        for cluster_index in self.cluster_any(X, eps):
+        for cluster_index in self.cluster_any(X, eps, grid=self.grid_index):
             yield data.loc[cluster_index]
 
+    def _cluster_positions(self, X, positions, eps, grid=False, chunk_size=None):
+        "Cluster the rows `positions` of array `X`, yielding the positions of each cluster."
+        for indices in self.cluster_any(X[positions], eps, grid=grid, chunk_size=chunk_size):
+            yield positions[indices]
+
     def split_markings_by_size(self, data, limit=210):
         kind = data.marking.value_counts()
         if len(kind) > 1:
@@ -337,11 +674,24 @@ class DBScanner:
         """Calculate min_samples for DBSCAN.
 
         From current self.msf value and no of classifications.
+        The value is cached per tile and msf, as it is needed for every DBSCAN fit.
         """
-        min_samples = round(self.msf * self.p4id.n_marked_classifications)
-        return max(3, min_samples)  # never use less than 3
+        p4id, msf, min_samples = self._min_samples_cache
+        if p4id is not self.p4id or msf != self.msf:
+            min_samples = round(self.msf * self.p4id.n_marked_classifications)
+            min_samples = max(3, min_samples)  # never use less than 3
+            self._min_samples_cache = (self.p4id, self.msf, min_samples)
+        return min_samples
+
+    @min_samples.setter
+    def min_samples(self, value):
+        "Fix min_samples for the current `self.p4id` and msf, e.g. for a whole obsid."
+        self._min_samples_cache = (self.p4id, self.msf, value)
 
     def setup_logfiles(self):
+        if self.fast_mode and self._logfiles_ready:
+            return
+        self._logfiles_ready = True
         if len(logger.handlers) > 0:
             for handler in logger.handlers:
                 if isinstance(handler, logging.FileHandler):
@@ -358,24 +708,174 @@ class DBScanner:
         logger.addHandler(fh)
         # logger.setLevel(logging.INFO)
 
-    def cluster_image_name(self, image_name, msf=None, eps_values=None):
-        "Cluster all image_ids for a given image_name (i.e. HiRISE obsid)"
+    def cluster_image_name(self, image_name, msf=None, eps_values=None, data=None):
+        """Cluster all image_ids for a given image_name (i.e. HiRISE obsid)
+
+        The markings of the obsid are read once and sorted by image_id, so that every
+        tile is clustered on a contiguous slice without further database access.
+
+        Parameters
+        ----------
+        image_name : str
+            HiRISE obsid
+        msf, eps_values : optional
+            As for `cluster_image_id`.
+        data : pandas.DataFrame, optional
+            Markings of the obsid, if already loaded. Default: read from `self.dbname`.
+        """
+        if self.global_clustering:
+            return self.cluster_obsid_global(image_name, msf, eps_values, data)
         if msf is not None:
             self.msf = msf
         self.pm.obsid = image_name
         self.setup_logfiles()
 
         logger.info("Clustering image_name %s with msf of %f.", image_name, self.msf)
-        db = io.DBManager(self.dbname, obsid = image_name)
-        data = db.get_obsid_markings(image_name)
-        image_ids = data.image_id.unique()
-        logger.debug("Number of image_ids found: %i", len(image_ids))
-        for image_id in tqdm(image_ids,desc=image_name):
+        if data is None:
+            db = io.DBManager(self.dbname, obsid = image_name)
+            data = db.get_obsid_markings(image_name)
+        index = TileIndex(data, column="image_id")
+        data = data.take(index.order)
+        logger.debug("Number of image_ids found: %i", len(index))
+        writer = None
+        if self.save_results and self.l1a_format == "parquet":
+            writer = io.L1AWriter(
+                self.pm.L1A_dataset,
+                self.clustering_settings(eps_values),
+                keep_previous=self.incremental,
+            )
+        if self.fast_mode:
+            self.counters.clear()
+            self._run_min_samples = {}
+        for image_id, (start, stop) in tqdm(index.offsets.items(), desc=image_name):
+            self.pm.id = image_id
+            self.cluster_image_id(
+                image_id, msf, eps_values, image_name, data=data.iloc[start:stop], writer=writer
+            )
+        if writer is not None:
+            writer.close()
+        if self.fast_mode:
+            if self.save_results and self.l1a_format == "csv":
+                self.write_run_settings_file(eps_values, self._run_min_samples)
+            self._run_min_samples = None
+            self.counters["tiles"] = len(index)
+            logger.info("Clustering counters for %s: %s", image_name, dict(self.counters))
+        elif self.incremental:
+            logger.info("Skipped %i unchanged tiles.", self.counters["tiles_skipped"])
+
+    def cluster_obsid_global(self, image_name, msf=None, eps_values=None, data=None):
+        """Cluster all markings of an obsid together, in HiRISE image coordinates.
+
+        Tile-wise clustering clusters the markings in the overlaps of neighboring tiles
+        twice, creating duplicates. Here the x, y clustering runs over image_x, image_y of
+        all tiles, in strips of at most `self.chunk_size` markings that are stitched
+        together at their borders (see `grid_dbscan`), followed by the usual radius and
+        angle clustering. One min_samples is used for the whole obsid: the median of the
+        tiles' values.
+
+        The results are stored per home tile, the tile with most of a cluster's
+        markings (see `assign_home_tiles`), so that the L1A output has the same layout
+        as for tile-wise clustering.
+
+        Parameters
+        ----------
+        image_name : str
+            HiRISE obsid
+        msf, eps_values : optional
+            As for `cluster_image_id`.
+        data : pandas.DataFrame, optional
+            Markings of the obsid, if already loaded. Default: read from `self.dbname`.
+        """
+        if msf is not None:
+            self.msf = msf
+        self.pm.obsid = image_name
+        self.setup_logfiles()
+        if data is None:
+            db = io.DBManager(self.dbname, obsid=image_name)
+            data = db.get_obsid_markings(image_name)
+        eps_values = self.eps_values if eps_values is None else eps_values
+        self.p4id = markings.TileID(
+            None, scope="p4tools", dbname=self.dbname, data=data, image_name=image_name
+        )
+        marked = data[data.marking.isin(["fan", "blotch"])]
+        n_classifications = marked.groupby("image_id", observed=True).classification_id.nunique()
+        median = n_classifications.median() if len(n_classifications) > 0 else 0
+        self.min_samples = max(3, round(self.msf * median))
+        logger.info(
+            "Clustering image_name %s globally with min_samples: %i", image_name, self.min_samples
+        )
+        self.cluster_markings(eps_values)
+        if self.save_results:
+            self.store_obsid_results(self.reduced_data, data["image_id"].unique(), eps_values)
+
+    def store_obsid_results(self, reduced_data, image_ids, eps_values=None):
+        """Store the results of `cluster_obsid_global` per home tile.
+
+        Parameters
+        ----------
+        reduced_data : dict
+            Averaged clusters per kind, with an image_id column for their home tile.
+        image_ids : iterable of str
+            All tiles of the obsid; tiles without clusters get their L1A files removed.
+        eps_values : dict, optional
+            eps values of the run. Default: `self.eps_values`
+        """
+        per_tile = {
+            kind: dict(list(df.groupby("image_id", sort=False))) if len(df) > 0 else {}
+            for kind, df in reduced_data.items()
+        }
+        writer = None
+        if self.l1a_format == "parquet":
+            writer = io.L1AWriter(self.pm.L1A_dataset, self.clustering_settings(eps_values))
+        elif self.l1a_format == "csv":
+            self.write_run_settings_file(eps_values, self.min_samples)
+        for image_id in image_ids:
             self.pm.id = image_id
-            self.cluster_image_id(image_id, msf, eps_values, image_name)
+            tile_data = {
+                kind: per_tile[kind][image_id].reset_index(drop=True)
+                if image_id in per_tile[kind]
+                else []
+                for kind in reduced_data
+            }
+            self.store_tile_results(tile_data, writer=writer, eps_values=eps_values)
+        if writer is not None:
+            writer.close()
+
+    def clustering_settings(self, eps_values=None):
+        "dict : The clustering settings shared by all tiles, as stored with L1A datasets."
+        eps_values = self.eps_values if eps_values is None else eps_values
+        return dict(
+            eps_values={kind: eps_values[kind] for kind in ["fan", "blotch"]},
+            msf=self.msf,
+            only_core_samples=self.only_core_samples,
+            with_angles=self.with_angles,
+            with_radii=self.with_radii,
+            do_large_run=self.do_large_run,
+            global_clustering=self.global_clustering,
+        )
+
+    def write_run_settings_file(self, eps_values, min_samples):
+        """Write the settings of a fast mode run once, at obsid level.
+
+        Parameters
+        ----------
+        eps_values : dict or None
+            eps values of the run. Default: `self.eps_values`
+        min_samples : dict
+            min_samples used per image_id.
+        """
+        settings = self.clustering_settings(eps_values)
+        settings["min_samples"] = min_samples
+        settingspath = self.pm.run_settings_file
+        settingspath.parent.mkdir(exist_ok=True, parents=True)
+        logger.info("Writing run settings file at %s", str(settingspath))
+        with open(settingspath, "w") as fp:
+            pyaml.dump(settings, fp)
 
-    def write_settings_file(self, eps_values):
-        eps_values["min_samples"] = self.min_samples
+    def write_settings_file(self, eps_values, min_samples=None):
+        "Write `eps_values` and the DBSCAN settings of the current tile next to its L1A files."
+        eps_values = dict(eps_values)
+        eps_values["min_samples"] = self.min_samples if min_samples is None else min_samples
         eps_values["only_core_samples"] = self.only_core_samples
         settingspath = self.pm.blotchfile.parent / "clustering_settings.yaml"
         settingspath.parent.mkdir(exist_ok=True, parents=True)
@@ -383,7 +883,9 @@ class DBScanner:
         with open(settingspath, "w") as fp:
             pyaml.dump(eps_values, fp)
 
-    def cluster_image_id(self, img_id, msf=None, eps_values=None, image_name=None):
+    def cluster_image_id(
+        self, img_id, msf=None, eps_values=None, image_name=None, data=None, writer=None
+    ):
         """Interface function for users to cluster data for one P4 image_id.
 
         This method does the data splitting in case it is required and calls the
@@ -400,6 +902,17 @@ class DBScanner:
         eps_values : dictionary, optional
             Dict with eps values for clustering, in the format as given in `self.eps_values`.
             If not provided, the default stored `self.eps_values` is used.
+        image_name : str, optional
+            HiRISE obsid of `img_id`, saves its lookup in the database.
+        data : pandas.DataFrame, optional
+            Markings of `img_id`. Default: `self.data`, or read from the database.
+        writer : io.L1AWriter, optional
+            Writer of the obsid's L1A dataset to append the results to. If not given and
+            `self.l1a_format` is 'parquet', the results replace the tile's rows in the
+            existing dataset, which rewrites the dataset's part files and is meant for
+            single tiles only. To replace several tiles, pass one
+            `io.L1AWriter(self.pm.L1A_dataset, self.clustering_settings(), overwrite=False)`
+            to all calls and close it afterwards.
 
         Returns
         -------
@@ -408,7 +921,11 @@ class DBScanner:
         `self.reduced_data`.
         """
         self.p4id = markings.TileID(
-            img_id, scope="p4tools", dbname=self.dbname, data=self.data, image_name=image_name
+            img_id,
+            scope="p4tools",
+            dbname=self.dbname,
+            data=self.data if data is None else data,
+            image_name=image_name,
         )
         self.pm.obsid = self.p4id.image_name
         self.pm.id = img_id
@@ -423,7 +940,86 @@ class DBScanner:
             self.msf = msf
 
         eps_values = self.eps_values if eps_values is None else eps_values
-        self.write_settings_file(eps_values)
+        if self._run_min_samples is not None:
+            # fast mode run: settings are written once at the end of the run
+            self._run_min_samples[self.pm.id] = self.min_samples
+
+        fingerprint = None
+        if self.save_results:
+            fingerprint = tile_fingerprint(self.p4id.data, self.clustering_settings(eps_values))
+            if self.incremental and self.is_unchanged(fingerprint, writer):
+                logger.info("Skipping unchanged tile %s.", img_id)
+                self.counters["tiles_skipped"] += 1
+                if writer is not None:
+                    writer.carry_over(img_id)
+                return
+
+        if self._run_min_samples is None and self.l1a_format == "csv":
+            self.write_settings_file(eps_values)
+        self.cluster_markings(eps_values)
+
+        if self.save_results:
+            self.store_tile_results(self.reduced_data, fingerprint, writer, eps_values=eps_values)
+
+    def is_unchanged(self, fingerprint, writer=None):
+        """Check if the stored L1A results of the current tile have the same `fingerprint`.
+
+        Parameters
+        ----------
+        fingerprint : str
+            `tile_fingerprint` of the current clustering inputs.
+        writer : io.L1AWriter, optional
+            Writer of a Parquet L1A dataset, which holds the previous fingerprints.
+        """
+        if writer is not None:
+            return writer.previous_fingerprints.get(self.pm.id) == fingerprint
+        if self.l1a_format == "csv":
+            path = self.pm.L1A_fingerprint_file
+            return path.exists() and path.read_text() == fingerprint
+        # appending single tiles to a Parquet dataset is never incremental
+        return False
+
+    def store_tile_results(
+        self, reduced_data, fingerprint=None, writer=None, min_samples=None, eps_values=None
+    ):
+        """Store the results of the current tile in the configured `l1a_format`.
+
+        Parameters
+        ----------
+        reduced_data : dict
+            Averaged clusters per kind, see `self.reduced_data`.
+        fingerprint : str, optional
+            `tile_fingerprint` of the clustering inputs, stored with the results.
+        writer : io.L1AWriter, optional
+            Writer of the obsid's Parquet dataset. Without it, Parquet results replace
+            the tile's rows in the existing dataset.
+        min_samples : int, optional
+            min_samples used for the tile. Default: `self.min_samples`
+        eps_values : dict, optional
+            Used for the settings of a new Parquet dataset. Default: `self.eps_values`
+        """
+        min_samples = self.min_samples if min_samples is None else min_samples
+        if self.l1a_format == "csv":
+            self.store_clustered(reduced_data)
+            if fingerprint is not None:
+                path = self.pm.L1A_fingerprint_file
+                path.parent.mkdir(exist_ok=True, parents=True)
+                path.write_text(fingerprint)
+        elif writer is not None:
+            writer.append(self.pm.id, self.pm.obsid, reduced_data, min_samples, fingerprint)
+        else:
+            with io.L1AWriter(
+                self.pm.L1A_dataset, self.clustering_settings(eps_values), overwrite=False
+            ) as writer:
+                writer.append(self.pm.id, self.pm.obsid, reduced_data, min_samples, fingerprint)
+
+    def cluster_markings(self, eps_values=None):
+        """Cluster fans and blotches of the current `self.p4id` into `self.reduced_data`.
+
+        This is the pure compute part of `cluster_image_id`: it neither writes settings,
+        logfiles nor results, so it can run in worker processes.
+        """
+        eps_values = self.eps_values if eps_values is None else eps_values
         # set up storage for results
         self.reduced_data = {}
         self.final_clusters = {}
@@ -451,7 +1047,7 @@ class DBScanner:
                 # with parameters for large objects
                 logger.info("Clustering on remaining data with large parameter set.")
                 self._setup_and_call_clustering(
-                    eps_values, self.remaining, kind, "large"
+                    eps_values, data, kind, "large", positions=self.remaining
                 )
             # merging small and large clustering results
             try:
@@ -462,70 +1058,88 @@ class DBScanner:
                 # i can just continue here, as I stored an empty list above already
                 continue
 
-        if self.save_results:
-            self.store_clustered(self.reduced_data)
-
-    def _setup_and_call_clustering(self, eps_values, dataset, kind, size):
+    def _setup_and_call_clustering(self, eps_values, dataset, kind, size, positions=None):
         """setup helper for the clustering pipeline.
 
         This just reads out the values from the eps_values structure and then calls
-        `_cluster_pipeline`.
+        `_cluster_pipeline`, optionally only on the rows `positions` of `dataset`.
         """
         logger.info("Processing %s dataset.", size)
         eps_xy = eps_values[kind]["xy"][size]
         eps_rad = eps_values[kind]["radius"][size]
-        logger.debug("Length of dataset: %i", len(dataset))
+        if positions is None:
+            positions = np.arange(len(dataset))
+        logger.debug("Length of dataset: %i", len(positions))
         self.reduced_data[kind].append(
-            self._cluster_pipeline(kind, dataset, eps_xy, eps_rad)
+            self._cluster_pipeline(kind, dataset, eps_xy, eps_rad, positions)
         )
         logger.debug("Appending %i items to final_clusters", len(self.finalclusters))
         self.final_clusters[kind].append(self.finalclusters)
 
-    def _calculate_unclustered(self, data, xyclusters):
-        data_in = data.dropna(how="all", axis=1)
-        try:
-            clustered = pd.concat(xyclusters).dropna(how="all", axis=1)
-        except ValueError:
-            self.remaining = []
-        else:
-            self.remaining = data_in[~data_in.isin(clustered).all(1)]
+    def _calculate_unclustered(self, data, positions, xyclusters):
+        """Store the positions of `positions` that are in none of `xyclusters` as `self.remaining`.
+
+        As before, nothing counts as remaining if no xy cluster was found at all.
+        """
+        if len(xyclusters) == 0:
+            self.remaining = positions[:0]
+            return
+        self.remaining = np.setdiff1d(positions, np.concatenate(xyclusters))
         if self.current_kind == "blotch" and len(self.remaining) > 0:
             eps = 0.00001
-            blotch_defaults = ((self.remaining.radius_1 - 10) < eps) & (
-                (self.remaining.radius_2 - 10).abs() < eps
-            )
+            radius_1 = data["radius_1"].to_numpy()[self.remaining]
+            radius_2 = data["radius_2"].to_numpy()[self.remaining]
+            blotch_defaults = ((radius_1 - 10) < eps) & (np.abs(radius_2 - 10) < eps)
             self.remaining = self.remaining[~blotch_defaults]
 
-    def _cluster_pipeline(self, kind, data, eps, eps_rad):
+    def _cluster_pipeline(self, kind, data, eps, eps_rad, positions=None):
         """Cluster pipeline that can cluster over xy, angles and radii.
 
         It does so without knowledge of different marking sizes, it just receives data and
         will cluster it together, successively.
+        Clusters are handled as integer positions into `data` (all rows if `positions` is
+        not given); rows are only gathered for the averaging.
         """
-        xyclusters = self.cluster_xy(data, eps)
-        xyclusters = list(xyclusters)
-        self._calculate_unclustered(data, xyclusters)
-        if self.with_radii and eps_rad is not None:
-            last = self.cluster_radii(xyclusters, eps_rad)
-        else:
-            last = xyclusters
-        last = list(last)
-        if self.with_angles and self.eps_values[kind]["angle"] is not None:
-            finalclusters = self.cluster_angles(last, kind)
+        if positions is None:
+            positions = np.arange(len(data))
+        logger.info("Clustering x,y with eps: %i", eps)
+        if self.global_clustering:
+            X = data[["image_x", "image_y"]].to_numpy()
+            clusters = list(self._cluster_positions(X, positions, eps, True, self.chunk_size))
         else:
-            finalclusters = last
-        last = list(last)
-        finalclusters = list(finalclusters)
-        self.finalclusters = finalclusters
-        averaged = get_average_objects(finalclusters, kind)
-        try:
-            reduced_data = pd.concat(averaged, ignore_index=True, sort=True)
-        except ValueError as e:
-            if e.args[0].startswith("No objects to concatenate"):
-                # logger.warning("No clusters survived.")
-                return None
-            else:
-                raise e
+            X = data[["x", "y"]].to_numpy()
+            clusters = list(self._cluster_positions(X, positions, eps, grid=self.grid_index))
+        self._calculate_unclustered(data, positions, clusters)
+        if self.with_radii and eps_rad is not None:
+            logger.info("Clustering radii with eps: %i", eps_rad)
+            X = data[["radius_1", "radius_2"]].to_numpy()
+            clusters = [
+                sub for cluster in clusters for sub in self._cluster_positions(X, cluster, eps_rad)
+            ]
+        eps_degrees = self.eps_values[kind]["angle"]
+        if self.with_angles and eps_degrees is not None:
+            logger.info("Clustering angles with eps: %i", eps_degrees)
+            cols_to_cluster = dict(blotch=["y_angle"], fan=["x_angle", "y_angle"])
+            X = data[cols_to_cluster[kind]].to_numpy()
+            # euclidean distance of unit vector end points per degree
+            eps_angle = eps_degrees * (np.pi * 2 / 360)
+            clusters = [
+                sub for cluster in clusters for sub in self._cluster_positions(X, cluster, eps_angle)
+            ]
+        self.finalclusters = [data.index[cluster] for cluster in clusters]
+        if not clusters:
+            # logger.warning("No clusters survived.")
+            return None
+        rows = np.concatenate(clusters)
+        labels = np.repeat(np.arange(len(clusters)), [len(cluster) for cluster in clusters])
+        members = data.iloc[rows]
+        if not self.global_clustering:
+            return average_clusters(members, labels, kind)
+        # average x, y in image coordinates, the markings can be from different tiles
+        reduced_data = average_clusters(
+            members.assign(x=members["image_x"], y=members["image_y"]), labels, kind
+        )
+        assign_home_tiles(members, labels, reduced_data)
         return reduced_data
 
     def parameter_scan(
@@ -633,3 +1247,153 @@ class DBScanner:
             df.to_csv(str(outpath.with_suffix(".csv")), index=False)
             logger.debug("Wrote %s", str(outpath.with_suffix(".csv")))
 
+# %% ../../notebooks/05e_production.dbscan.ipynb 8
+def _refine_clusters(labels, steps, min_samples):
+    """Split the xy clusters given by `labels` like the later steps of `_cluster_pipeline`.
+
+    `steps` is a list of (features, eps), each cluster is re-clustered on its rows of
+    `features` and only the resulting sub-clusters are kept.
+    """
+    clusters = [np.flatnonzero(labels == label) for label in range(labels.max() + 1)]
+    for features, eps in steps:
+        refined = []
+        for cluster in clusters:
+            sub_labels = DBSCAN(eps, min_samples=min_samples).fit(features[cluster]).labels_
+            refined += [cluster[sub_labels == label] for label in range(sub_labels.max() + 1)]
+        clusters = refined
+    return clusters
+
+
+def _scan_tile(X, n_classifications, msf_values, eps_values, steps=()):
+    """Scan DBSCAN clustering of one tile's markings `X` over all msf/eps combinations.
+
+    The radius-neighbors graph is built once at the largest eps; DBSCAN fits with smaller
+    eps use it as sparse precomputed distance matrix, which gives the same labels as
+    fitting on `X` itself. The xy clusters are then refined with `steps`, see
+    `_refine_clusters`.
+    """
+    graph = radius_neighbors_graph(X, max(eps_values), mode="distance")
+    results = {}
+    for msf, eps in product(msf_values, eps_values):
+        # same min_samples rule as `DBScanner.min_samples`
+        min_samples = max(3, round(msf * n_classifications))
+        key = (min_samples, eps)
+        if key not in results:
+            if len(X) < min_samples:
+                # `DBScanner.cluster_markings` skips clustering in this case
+                labels = np.full(len(X), -1)
+            else:
+                db = DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed")
+                labels = db.fit(graph).labels_
+            clusters = _refine_clusters(labels, steps, min_samples)
+            results[key] = (labels.max() + 1, len(clusters), sum(len(c) for c in clusters))
+        n_xy_clusters, n_clusters, n_clustered = results[key]
+        yield dict(
+            msf=msf,
+            min_samples=min_samples,
+            eps=eps,
+            n_markings=len(X),
+            n_xy_clusters=n_xy_clusters,
+            n_clusters=n_clusters,
+            n_noise=len(X) - n_clustered,
+            n_clustered=n_clustered,
+        )
+
+
+def _refinement_steps(scanner, kind, data):
+    "The (features, eps) steps after xy clustering in `DBScanner._cluster_pipeline`."
+    steps = []
+    eps_rad = scanner.eps_values[kind]["radius"]["small"]
+    if scanner.with_radii and eps_rad is not None:
+        steps.append((data[["radius_1", "radius_2"]].to_numpy(), eps_rad))
+    eps_degrees = scanner.eps_values[kind]["angle"]
+    if scanner.with_angles and eps_degrees is not None:
+        cols_to_cluster = dict(blotch=["y_angle"], fan=["x_angle", "y_angle"])
+        steps.append((data[cols_to_cluster[kind]].to_numpy(), eps_degrees * (np.pi * 2 / 360)))
+    return steps
+
+
+def scan_parameters(data, msf_values, eps_values, kinds=("fan", "blotch"), plot=False, scanner=None):
+    """Scan the clustering of many tiles over msf and xy eps values.
+
+    Each tile and marking kind gets one neighbor graph, from which the DBSCAN labels
+    for all parameter combinations are derived, so scanning thousands of tiles is
+    feasible. The xy clusters are refined by angle and radius like in the first
+    (small markings) pass of `DBScanner.cluster_markings`; the second pass over the
+    remaining large markings is not part of the scan.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Marking data of one or more tiles, e.g. of one obsid.
+    msf_values : iterable of float
+        m_ean s_amples f_actors to scan.
+    eps_values : iterable of float
+        xy eps values (in pixels) to scan.
+    kinds : iterable of {'fan', 'blotch'}, optional
+        Marking kinds to scan.
+    plot : bool, optional
+        If True, also plot the results with `plot_parameter_scan`.
+    scanner : DBScanner, optional
+        Its `with_angles`, `with_radii` and `eps_values` decide the refinement steps.
+        Default: `DBScanner()` settings.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per image_id, kind, msf and eps, with the columns min_samples,
+        n_markings, n_xy_clusters (before the refinement), n_clusters, n_noise and
+        n_clustered.
+    """
+    msf_values = list(np.atleast_1d(msf_values))
+    eps_values = list(np.atleast_1d(eps_values))
+    scanner = DBScanner(save_results=False) if scanner is None else scanner
+    index = TileIndex(data, column="image_id")
+    rows = []
+    for image_id in tqdm(index.tile_ids, desc="Scanning tiles"):
+        tile = index.get(image_id)
+        marked = tile.marking.isin(["fan", "blotch"])
+        n_classifications = tile.classification_id[marked].nunique()
+        for kind in kinds:
+            markings = tile[tile.marking == kind]
+            if len(markings) == 0:
+                continue
+            X = markings[["x", "y"]].to_numpy()
+            for row in _scan_tile(X, n_classifications, msf_values, eps_values,
+                                  _refinement_steps(scanner, kind, markings)):
+                rows.append(dict(image_id=image_id, kind=kind, **row))
+    results = pd.DataFrame(rows)
+    if plot:
+        plot_parameter_scan(results)
+    return results
+
+
+def plot_parameter_scan(results, axes=None):
+    """Plot the mean number of clusters and the clustered fraction over eps per msf.
+
+    Parameters
+    ----------
+    results : pandas.DataFrame
+        Output of `scan_parameters`.
+    axes : array of matplotlib.axes.Axes, optional
+        Two axes per kind (rows: kinds). If None, a new figure is created.
+    """
+    kinds = results.kind.unique()
+    if axes is None:
+        _, axes = plt.subplots(nrows=len(kinds), ncols=2, figsize=(10, 4 * len(kinds)), squeeze=False)
+    for (ax_n, ax_frac), kind in zip(axes, kinds):
+        summary = (
+            results[results.kind == kind]
+            .groupby(["msf", "eps"])[["n_clusters", "n_clustered", "n_markings"]]
+            .sum()
+            .reset_index()
+        )
+        n_tiles = results[results.kind == kind].image_id.nunique()
+        for msf, df in summary.groupby("msf"):
+            ax_n.plot(df.eps, df.n_clusters / n_tiles, marker="o", label=f"msf: {msf}")
+            ax_frac.plot(df.eps, df.n_clustered / df.n_markings, marker="o", label=f"msf: {msf}")
+        ax_n.set_title(f"{kind}: mean clusters per tile, after refinement")
+        ax_frac.set_title(f"{kind}: clustered fraction of markings, after refinement")
+        for ax in (ax_n, ax_frac):
+            ax.set_xlabel("eps [pixels]")
+            ax.legend()
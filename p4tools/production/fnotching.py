@@ -1,21 +1,24 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../notebooks/05f_production.fnotching.ipynb.
 
 # %% auto 0
-__all__ = ['logger', 'data_to_centers', 'get_id_from_path', 'get_clusters_in_path', 'remove_opposing_fans',
-           'calc_indices_from_index', 'fnotch_image_ids', 'write_l1c', 'apply_cut_obsid', 'apply_cut']
+__all__ = ['logger', 'data_to_centers', 'get_id_from_path', 'get_clusters_in_path', 'find_close_pairs', 'remove_opposing_fans',
+           'calc_indices_from_index', 'get_image_id_clusters', 'fnotch_image_ids', 'write_l1b', 'get_obsid_clusters',
+           'remove_tile_duplicates', 'fnotch_obsid', 'write_l1c', 'read_l1b', 'write_l1c_cuts', 'apply_cuts',
+           'apply_cut_obsid', 'apply_cut']
 
 # %% ../../notebooks/05f_production.fnotching.ipynb 1
 from . import io
-from ..markings import Blotch,Fan
+from ..markings import BlotchArray, FanArray
 from . import markings
 
 
 import logging
 import numpy as np
-from scipy.spatial.distance import cdist, pdist
+from scipy.spatial import cKDTree
 import math
 import pandas as pd
 import random
+import warnings
 
 logger = logging.getLogger(__name__)
 
@@ -23,24 +26,26 @@ logger = logging.getLogger(__name__)
 def data_to_centers(df, kind, scope="hirise"):
     """Convert a dataframe with marking data to an array of center coords.
 
+    The centers of all rows are computed at once by `FanArray`/`BlotchArray`, with
+    the same results as `Fan.center`/`Blotch.center` of the single markings.
+
     Parameters
     ----------
     df : pd.dataframe
-        Dataframe with either fan or blotch marking data. It probes itself
-        which one it is by looking at if distances and radii are defined.
+        Dataframe with either fan or blotch marking data.
     kind : {'fan', 'blotch'}
+    scope : {'hirise', 'planet4'}
+        Use image_x/image_y or x/y coordinates.
     Returns
     -------
     np.array
         Array with the center coordinates, dimensions: (rows, 2)
     """
     if kind == "blotch":
-        # only the blotch arrays have distance un-defined
-        Marking = Blotch
+        Markings = BlotchArray
     else:
-        Marking = Fan
-    
-    return np.vstack([Marking(row, scope=scope).center for _, row in df.iterrows()])
+        Markings = FanArray
+    return Markings(df, scope=scope).center
 
 #UHM maybe remove that
 def get_id_from_path(path):
@@ -70,6 +75,44 @@ def get_clusters_in_path(path):
         clusters.append(df)
     return clusters
 
+def find_close_pairs(centers, eps, others=None):
+    """Find all pairs of centers that are closer than `eps`, with a KD-tree.
+
+    Only the close pairs are looked at, so no n x n distance matrix is created.
+
+    Parameters
+    ----------
+    centers : np.array, shape (n, 2)
+        Center coordinates, e.g. from `data_to_centers`.
+    eps : float
+        Pairs with a distance smaller than `eps` are returned.
+    others : np.array, shape (m, 2), optional
+        If given, pairs between `centers` and `others` are searched instead of pairs
+        within `centers`.
+
+    Returns
+    -------
+    i, j : np.array
+        Row indices of the pairs, into `centers` and into `others` (or `centers`, then
+        with i < j). Sorted by i, then j, in the order of the condensed distance
+        matrix of `pdist` resp. of `np.where` on the matrix of `cdist`.
+    """
+    tree = cKDTree(centers)
+    if others is None:
+        pairs = tree.query_pairs(eps, output_type="ndarray")
+        i, j = pairs[:, 0], pairs[:, 1]
+        others = centers
+    else:
+        pairs = tree.sparse_distance_matrix(cKDTree(others), eps, output_type="ndarray")
+        i, j = pairs["i"], pairs["j"]
+    # the tree includes pairs at exactly eps distance, the pairs need to be closer
+    diff = centers[i] - others[j]
+    close = np.sqrt((diff * diff).sum(axis=1)) < eps
+    i, j = i[close], j[close]
+    order = np.lexsort((j, i))
+    return i[order].astype("int"), j[order].astype("int")
+
+
 def remove_opposing_fans(fans, eps=20):
     """Find fans that have opposite orientation and remove lower voted one.
 
@@ -89,28 +132,25 @@ def remove_opposing_fans(fans, eps=20):
     pd.DataFrame
         Data with opposing fans removed.
     """
-    distances = pdist(data_to_centers(fans, "fan"))
-    close_indices = np.where(distances < eps)[0]
-    ind_to_remove = []
-    for index in close_indices:
-        fan_indices = calc_indices_from_index(len(distances), index)
-        # use squeeze to force creation of pd.Series
-        f1 = fans.iloc[fan_indices[0]].squeeze()
-        f2 = fans.iloc[fan_indices[1]].squeeze()
-        angle_diff = f1.angle - f2.angle
-        # if they differ by between 175 and 185:
-        if abs(angle_diff - 180) < 5:
-            if f1.n_votes < f2.n_votes:
-                ind_to_remove.append(fan_indices[0])
-            elif f1.n_votes > f2.n_votes:
-                ind_to_remove.append(fan_indices[1])
-            else:
-                ind_to_remove.append(fan_indices[random.randint(0, 1)])
-    return fans.drop(ind_to_remove)
+    i, j = find_close_pairs(data_to_centers(fans, "fan"), eps)
+    angle = fans.angle.to_numpy()
+    # if they differ by between 175 and 185:
+    opposing = np.abs(angle[i] - angle[j] - 180) < 5
+    i, j = i[opposing], j[opposing]
+    n_votes = fans.n_votes.to_numpy()
+    to_remove = np.where(n_votes[i] < n_votes[j], i, j)
+    tie = n_votes[i] == n_votes[j]
+    to_remove[tie] = [pair[random.randint(0, 1)] for pair in zip(i[tie], j[tie])]
+    keep = np.ones(len(fans), dtype="bool")
+    keep[to_remove] = False
+    return fans[keep]
 
 def calc_indices_from_index(n, c):
     """calculate source indices from condensed distance matrix.
 
+    Deprecated: the pairs of close markings are found by `find_close_pairs`, which
+    returns their indices directly.
+
     The `pdist` function returns its measurements in a (01, 02, 03, 12, 13...)
     fashion and this function can be used to get out the original coordinates
     of the 2 inputs.
@@ -128,12 +168,46 @@ def calc_indices_from_index(n, c):
         Coordinate pair of the 2 indices that were used to calculate distance
         at index c of the condensed distance matrix.
     """
+    warnings.warn(
+        "calc_indices_from_index is deprecated, use find_close_pairs.", DeprecationWarning, stacklevel=2
+    )
     n = math.ceil(math.sqrt(2 * n))
     ti = np.triu_indices(n, 1)
     return ti[0][c], ti[1][c]
 
-
 # %% ../../notebooks/05f_production.fnotching.ipynb 4
+def get_image_id_clusters(obsid, savedir=None):
+    """Yield the L1A fans and blotches of each image_id of an obsid.
+
+    They are read from the obsid's Parquet L1A dataset if it exists, otherwise from the
+    CSV files of its tiles.
+
+    Parameters
+    ----------
+    obsid : str
+        HiRISE obsid, i.e. P4 `image_name`
+    savedir : str, optional
+        Directory of the clustering results.
+
+    Yields
+    ------
+    image_id : str
+    fans, blotches : pd.DataFrame or None
+        None if the tile has no clustered markings of that kind.
+    """
+    pm = io.PathManager(obsid=obsid, datapath=savedir)
+    if not pm.L1A_dataset.exists():
+        for path in pm.get_obsid_paths("L1A"):
+            yield (get_id_from_path(path), *get_clusters_in_path(path))
+        return
+    per_tile = []
+    for kind in ["fan", "blotch"]:
+        df = io.read_L1A_dataset(pm.L1A_dataset, kind)
+        per_tile.append(dict(list(df.groupby("image_id", sort=False))) if len(df) > 0 else {})
+    for id_ in sorted(set(per_tile[0]) | set(per_tile[1])):
+        yield (id_, *[tiles[id_].reset_index(drop=True) if id_ in tiles else None for tiles in per_tile])
+
+
 def fnotch_image_ids(obsid, eps=20, savedir=None, scope="hirise"):
     """
     Cluster each image_id for an obsid separately and perform fnotching.
@@ -158,64 +232,196 @@ def fnotch_image_ids(obsid, eps=20, savedir=None, scope="hirise"):
 
     # the clustering results were stored as L1A products
     pm = io.PathManager(obsid=obsid, datapath=savedir)
-    paths = pm.get_obsid_paths("L1A")
-    if len(paths) == 0:
+    tiles = list(get_image_id_clusters(obsid, savedir))
+    if len(tiles) == 0:
         logger.warning("No paths to fnotch found for %s", obsid)
-    for path in paths:
-        id_ = get_id_from_path(path)
+    for id_, fans, blotches in tiles:
         pm.id = id_
         # make sure the L1B folder exists
         pm.reduced_fanfile.parent.mkdir(parents=True, exist_ok=True)
 
-        fans, blotches = get_clusters_in_path(path)
         if fans is not None and len(fans) > 1:
             # clean up fans with opposite angles
             fans = remove_opposing_fans(fans)
-        if not any([fans is None, blotches is None]):
-            logger.debug("Fnotching %s", id_)
-            distances = cdist(
-                data_to_centers(fans, "fan", scope=scope),
-                data_to_centers(blotches, "blotch", scope=scope),
-            )
-            X, Y = np.where(distances < eps)
-            # X are the indices along the fans input, Y for blotches respectively
-
-            # loop over fans and blotches that are within `eps` pixels:
-            fnotches = []
-            for fan_loc, blotch_loc in zip(X, Y):
-                fan = fans.iloc[[fan_loc]]
-                blotch = blotches.iloc[[blotch_loc]]
-                fnotches.append(markings.Fnotch(fan, blotch).data)
-
-            # store the combined fnotches into one file. The `votes_ratio` is
-            # stored as well, making it simple to filter/cut on these later for the
-            # L1C product.
-            try:
-                pd.concat(fnotches).to_csv(pm.fnotchfile)
-            except ValueError as e:
-                # this is fine, just means notching to fnotch.
-                if e.args[0].startswith("No objects to concatenate"):
-                    logger.debug("No fnotches found for %s.", id_)
-                else:
-                    # if it's a different error, raise it though:
-                    raise ValueError
-
-            # write out the fans and blotches that where not within fnotching distance:
-            fans_remaining = fans.loc[list(set(fans.index) - set(X))]
-            if len(fans_remaining) > 0:
-                fans_remaining.to_csv(pm.reduced_fanfile, index=False)
-            blotches_remaining = blotches.loc[list(set(blotches.index) - set(Y))]
-            if len(blotches_remaining) > 0:
-                blotches_remaining.to_csv(pm.reduced_blotchfile, index=False)
-        else:
-            if blotches is not None:
-                blotches.to_csv(pm.reduced_blotchfile, index=False)
-            if fans is not None:
-                fans.to_csv(pm.reduced_fanfile, index=False)
+        logger.debug("Fnotching %s", id_)
+        write_l1b(pm, fans, blotches, eps, scope)
+
 
+def write_l1b(pm, fans, blotches, eps=20, scope="hirise"):
+    """Fnotch fans and blotches that are closer than `eps` and write the L1B files.
+
+    Parameters
+    ----------
+    pm : io.PathManager
+        The PathManager for the current image_id, or for the obsid if no id is set.
+    fans, blotches : pd.DataFrame or None
+        Clustered fans and blotches.
+    eps : int, optional
+        The maximum distance in pixels to consider for fnotching.
+    scope : str, optional
+        Coordinate scope of the calculation.
+    """
+    if not any([fans is None, blotches is None]):
+        X, Y = find_close_pairs(
+            data_to_centers(fans, "fan", scope=scope),
+            eps,
+            data_to_centers(blotches, "blotch", scope=scope),
+        )
+        # X are the indices along the fans input, Y for blotches respectively
+
+        # store the fnotches of all fans and blotches that are within `eps` pixels into
+        # one file. The `votes_ratio` is stored as well, making it simple to
+        # filter/cut on these later for the L1C product.
+        if len(X) > 0:
+            markings.fnotch_table(fans, blotches, X, Y).to_csv(pm.fnotchfile)
+        else:
+            logger.debug("No fnotches found.")
+
+        # write out the fans and blotches that where not within fnotching distance:
+        fan_fnotched = np.zeros(len(fans), dtype="bool")
+        fan_fnotched[X] = True
+        fans_remaining = fans[~fan_fnotched]
+        if len(fans_remaining) > 0:
+            fans_remaining.to_csv(pm.reduced_fanfile, index=False)
+        blotch_fnotched = np.zeros(len(blotches), dtype="bool")
+        blotch_fnotched[Y] = True
+        blotches_remaining = blotches[~blotch_fnotched]
+        if len(blotches_remaining) > 0:
+            blotches_remaining.to_csv(pm.reduced_blotchfile, index=False)
+    else:
+        if blotches is not None:
+            blotches.to_csv(pm.reduced_blotchfile, index=False)
+        if fans is not None:
+            fans.to_csv(pm.reduced_fanfile, index=False)
 
 # %% ../../notebooks/05f_production.fnotching.ipynb 5
-def write_l1c(kind, slashed, pm):
+def get_obsid_clusters(obsid, savedir=None):
+    """Read the L1A fans and blotches of all tiles of an obsid.
+
+    They are read from the obsid's Parquet L1A dataset if it exists, otherwise from the
+    CSV files of its tiles.
+
+    Parameters
+    ----------
+    obsid : str
+        HiRISE obsid, i.e. P4 `image_name`
+    savedir : str, optional
+        Directory of the clustering results.
+
+    Returns
+    -------
+    fans, blotches : pd.DataFrame or None
+        None if there are no clustered markings of that kind.
+    """
+    pm = io.PathManager(obsid=obsid, datapath=savedir)
+    if pm.L1A_dataset.exists():
+        clusters = [io.read_L1A_dataset(pm.L1A_dataset, kind) for kind in ["fan", "blotch"]]
+    else:
+        buckets = ([], [])
+        for path in pm.get_obsid_paths("L1A"):
+            for bucket, df in zip(buckets, get_clusters_in_path(path)):
+                if df is not None:
+                    bucket.append(df)
+        clusters = [pd.concat(bucket, ignore_index=True) if bucket else None for bucket in buckets]
+    return [df if df is not None and len(df) > 0 else None for df in clusters]
+
+
+def remove_tile_duplicates(clusters, kind, eps=20, max_angle_diff=20):
+    """Remove the duplicates of markings in the overlaps of neighboring tiles.
+
+    P4 tiles overlap, so objects in the overlaps are clustered in each of their tiles.
+    Markings of different tiles with centers closer than `eps` (in HiRISE coordinates)
+    are duplicates, fans only if their angles differ by less than `max_angle_diff`
+    degrees. Duplicates are grouped pairwise, closest pairs first, and a group never
+    takes two markings of the same tile, so that a chain of pairs across the overlaps
+    can not merge different objects of one tile. Of each group of duplicates, the one
+    with most votes is kept.
+
+    Parameters
+    ----------
+    clusters : pd.DataFrame
+        Clustered markings of all tiles of an obsid, e.g. from `get_obsid_clusters`.
+    kind : {'fan', 'blotch'}
+    eps : int, optional
+        Maximum distance of duplicates in pixels.
+    max_angle_diff : float, optional
+        Maximum angle difference of fan duplicates in degrees.
+
+    Returns
+    -------
+    pd.DataFrame
+        `clusters` without the duplicates.
+    """
+    centers = data_to_centers(clusters, kind)
+    i, j = find_close_pairs(centers, eps)
+    tiles = clusters.image_id.to_numpy()
+    duplicate = tiles[i] != tiles[j]
+    if kind == "fan":
+        angle = clusters.angle.to_numpy()
+        angle_diff = np.abs(angle[i] - angle[j]) % 360
+        duplicate &= np.minimum(angle_diff, 360 - angle_diff) < max_angle_diff
+    i, j = i[duplicate], j[duplicate]
+    n = len(clusters)
+    groups = np.arange(n)
+    members = {}
+    for pair in np.argsort(np.hypot(*(centers[i] - centers[j]).T), kind="stable"):
+        a, b = groups[i[pair]], groups[j[pair]]
+        if a == b:
+            continue
+        members_a, members_b = members.pop(a, [a]), members.pop(b, [b])
+        if set(tiles[members_a]) & set(tiles[members_b]):
+            # both groups have a marking in the same tile
+            members[a], members[b] = members_a, members_b
+            continue
+        groups[members_b] = a
+        members[a] = members_a + members_b
+    # keep the marking with most votes of each group, the first one on a tie
+    order = np.lexsort((np.arange(n), -clusters.n_votes.to_numpy(), groups))
+    first = np.r_[True, groups[order][1:] != groups[order][:-1]]
+    keep = np.zeros(n, dtype="bool")
+    keep[order[first]] = True
+    logger.debug("Removing %i %s duplicates of overlapping tiles.", n - keep.sum(), kind)
+    return clusters[keep]
+
+
+def fnotch_obsid(obsid, eps=20, savedir=None):
+    """Fnotch all clustered markings of an obsid at once, in HiRISE coordinates.
+
+    The L1A fans and blotches of all tiles are read together, duplicates from the tile
+    overlaps are removed (see `remove_tile_duplicates`), then opposing fans are removed
+    and fans and blotches are fnotched as in `fnotch_image_ids`, just across tile
+    borders. One set of L1B files is written for the whole obsid; `apply_cut_obsid`
+    creates the L1C files from them.
+
+    Parameters
+    ----------
+    obsid : str
+        HiRISE obsid, i.e. P4 `image_name`
+    eps : int, optional
+        The maximum distance in pixels to consider for fnotching, by default 20.
+    savedir : str, optional
+        Directory where the results will be saved, by default None.
+    """
+    fans, blotches = get_obsid_clusters(obsid, savedir)
+    if fans is None and blotches is None:
+        logger.warning("No clusters to fnotch found for %s", obsid)
+        return
+    if fans is not None:
+        fans = remove_tile_duplicates(fans, "fan", eps)
+        if len(fans) > 1:
+            fans = remove_opposing_fans(fans, eps)
+    if blotches is not None:
+        blotches = remove_tile_duplicates(blotches, "blotch", eps)
+    pm = io.PathManager(obsid=obsid, datapath=savedir)
+    pm.reduced_fanfile.parent.mkdir(parents=True, exist_ok=True)
+    for path in [pm.fnotchfile, pm.reduced_fanfile, pm.reduced_blotchfile]:
+        # clear the results of a previous run
+        path.unlink(missing_ok=True)
+    logger.debug("Fnotching %s", obsid)
+    write_l1b(pm, fans, blotches, eps, scope="hirise")
+
+# %% ../../notebooks/05f_production.fnotching.ipynb 8
+def write_l1c(kind, slashed, pm, reduced=None):
     """Write the L1C for marking `kind`.
 
     Parameters
@@ -226,6 +432,9 @@ def write_l1c(kind, slashed, pm):
         The remaining fnotch data after applying the cut
     pm : io.PathManager
         The PathManager for the current image_id
+    reduced : pd.DataFrame, optional
+        The L1B data of `kind` that was not fnotched, if already read.
+        Default: read from `pm`.
     """
     logger.debug("Writing l1c for %s", kind)
     try:
@@ -235,12 +444,15 @@ def write_l1c(kind, slashed, pm):
         new_kinds = pd.DataFrame()
     l1c = getattr(pm, f"final_{kind}file")
     l1c.parent.mkdir(parents=True, exist_ok=True)
-    try:
-        # the pathmanager can read the csv files as well:
-        old_kinds = getattr(pm, f"reduced_{kind}df")
-    except FileNotFoundError:
-        logger.debug("No old %s file.", kind)
-        old_kinds = pd.DataFrame()
+    if reduced is not None:
+        old_kinds = reduced
+    else:
+        try:
+            # the pathmanager can read the csv files as well:
+            old_kinds = getattr(pm, f"reduced_{kind}df")
+        except FileNotFoundError:
+            logger.debug("No old %s file.", kind)
+            old_kinds = pd.DataFrame()
     logger.debug("Combining. Writing to %s", str(l1c))
     combined = pd.concat([old_kinds, new_kinds], ignore_index=True, sort=False)
     combined.dropna(how="all", axis=1, inplace=True)
@@ -248,62 +460,113 @@ def write_l1c(kind, slashed, pm):
         logger.debug("Writing %s", str(l1c))
         combined.to_csv(str(l1c), index=False)
 
+# %% ../../notebooks/05f_production.fnotching.ipynb 9
+def read_l1b(pm):
+    """Read the L1B data of the current image_id (or obsid) of `pm`.
 
-# %% ../../notebooks/05f_production.fnotching.ipynb 6
-#TODO probably combine
-def apply_cut_obsid(obsid, cut=0.5, savedir=None):
-    pm = io.PathManager(obsid=obsid, cut=cut, datapath=savedir)
+    Returns
+    -------
+    dict
+        The not fnotched 'fan' and 'blotch' data, empty DataFrames if there is none, and
+        the 'fnotch' data, None if there were no fnotches.
+    """
+    l1b = {}
+    for kind in ["fan", "blotch"]:
+        try:
+            # the pathmanager can read the csv files as well:
+            l1b[kind] = getattr(pm, f"reduced_{kind}df")
+        except FileNotFoundError:
+            logger.debug("No old %s file.", kind)
+            l1b[kind] = pd.DataFrame()
     try:
-        fnotches = pm.fnotchdf
+        l1b["fnotch"] = pm.fnotchdf
     except FileNotFoundError:
-        # no fnotch df was found. Now need to copy over
-        # standard files to L1C folder
-        pm.final_blotchfile.parent.mkdir(exist_ok=True)
-        if pm.reduced_blotchfile.exists():
-            logger.debug("Writing final_blotchfile for %s", obsid)
-            pm.reduced_blotchdf.to_csv(pm.final_blotchfile, index=False)
-        if pm.reduced_fanfile.exists():
-            logger.debug("Writing final_fanfile for %s", obsid)
-            pm.reduced_fandf.to_csv(pm.final_fanfile, index=False)
-    else:
-        # apply cut
-        slashed = fnotches[fnotches.vote_ratio > pm.cut]
-        for kind in ["fan", "blotch"]:
-            write_l1c(kind, slashed, pm)
+        l1b["fnotch"] = None
+    return l1b
 
 
-# %% ../../notebooks/05f_production.fnotching.ipynb 7
-def apply_cut(obsid, cut=0.5, savedir=None):
-    """Loop over all image_id paths for an obsid and apply cut to fnotches.
+def write_l1c_cuts(pm, cuts):
+    """Write the L1C data of the current image_id (or obsid) of `pm` for all `cuts`.
+
+    The L1B data is read only once for all cut values.
 
     Parameters
     ----------
-    obsid : str
-        HiRISE obsid, i.e. P4 `image_name`
-    cut : float, 0..1
-        Value where to cut the vote_ratio of the fnotches.
+    pm : io.PathManager
+        The PathManager for the current image_id, or for the obsid if no id is set.
+    cuts : iterable of float, 0..1
+        Values where to cut the vote_ratio of the fnotches.
     """
-    pm = io.PathManager(obsid=obsid, cut=cut, datapath=savedir)
-    paths = pm.get_obsid_paths("L1B")
-    for path in paths:
-        id_ = get_id_from_path(path)
-        logger.debug("Slashing %s", id_)
-        pm.id = id_
-        try:
-            fnotches = pm.fnotchdf
-        except FileNotFoundError:
+    l1b = read_l1b(pm)
+    fnotches = l1b["fnotch"]
+    for cut in cuts:
+        pm.cut = cut
+        if fnotches is None:
             # no fnotch df was found. Now need to copy over
             # standard files to L1C folder
             pm.final_blotchfile.parent.mkdir(exist_ok=True)
-            if pm.reduced_blotchfile.exists():
-                logger.debug("Writing final_blotchfile for %s", id_)
-                pm.reduced_blotchdf.to_csv(pm.final_blotchfile, index=False)
-            if pm.reduced_fanfile.exists():
-                logger.debug("Writing final_fanfile for %s", id_)
-                pm.reduced_fandf.to_csv(pm.final_fanfile, index=False)
+            for kind in ["blotch", "fan"]:
+                if len(l1b[kind].columns) > 0:
+                    logger.debug("Writing final_%sfile for %s", kind, pm.id or pm.obsid)
+                    l1b[kind].to_csv(getattr(pm, f"final_{kind}file"), index=False)
         else:
             # apply cut
             slashed = fnotches[fnotches.vote_ratio > pm.cut]
             for kind in ["fan", "blotch"]:
-                write_l1c(kind, slashed, pm)
+                write_l1c(kind, slashed, pm, l1b[kind])
+
+
+def apply_cuts(obsid, cuts=(0.5,), savedir=None, via_obsid=False):
+    """Apply several cuts to the fnotches of an obsid, reading each L1B file once.
 
+    Creates one L1C folder per cut value, like calling `apply_cut` (or
+    `apply_cut_obsid`) for each cut, e.g. for studies of the cut's influence.
+
+    Parameters
+    ----------
+    obsid : str
+        HiRISE obsid, i.e. P4 `image_name`
+    cuts : iterable of float, 0..1
+        Values where to cut the vote_ratio of the fnotches.
+    savedir : str, optional
+        Directory of the clustering results.
+    via_obsid : bool, optional
+        Apply the cuts to the obsid-level L1B data of `fnotch_obsid` instead of the L1B
+        data of the single image_ids.
+    """
+    pm = io.PathManager(obsid=obsid, datapath=savedir)
+    if via_obsid:
+        write_l1c_cuts(pm, cuts)
+        return
+    paths = pm.get_obsid_paths("L1B")
+    for path in paths:
+        id_ = get_id_from_path(path)
+        logger.debug("Slashing %s", id_)
+        pm.id = id_
+        write_l1c_cuts(pm, cuts)
+
+# %% ../../notebooks/05f_production.fnotching.ipynb 10
+def apply_cut_obsid(obsid, cut=0.5, savedir=None):
+    """Apply cut to the fnotches of an obsid fnotched by `fnotch_obsid`.
+
+    Parameters
+    ----------
+    obsid : str
+        HiRISE obsid, i.e. P4 `image_name`
+    cut : float, 0..1
+        Value where to cut the vote_ratio of the fnotches.
+    """
+    apply_cuts(obsid, [cut], savedir, via_obsid=True)
+
+# %% ../../notebooks/05f_production.fnotching.ipynb 11
+def apply_cut(obsid, cut=0.5, savedir=None):
+    """Loop over all image_id paths for an obsid and apply cut to fnotches.
+
+    Parameters
+    ----------
+    obsid : str
+        HiRISE obsid, i.e. P4 `image_name`
+    cut : float, 0..1
+        Value where to cut the vote_ratio of the fnotches.
+    """
+    apply_cuts(obsid, [cut], savedir)
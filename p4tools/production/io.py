@@ -11,16 +11,20 @@ from pathlib import Path
 import pandas as pd
 import logging
 import configparser
+import json
+import shutil
 import dask.dataframe as dd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 ###imports typing
 from configparser import ConfigParser
 
-
-
 # %% auto 0
-__all__ = ['LOGGER', 'pkg_name', 'configpath', 'get_config', 'set_database_path', 'get_data_root', 'get_ground_projection_root',
-           'check_and_pad_id', 'PathManager', 'DBManager']
+__all__ = ['LOGGER', 'pkg_name', 'configpath', 'L1A_SETTINGS_KEY', 'L1A_FINGERPRINTS_KEY', 'get_config', 'set_database_path',
+           'get_data_root', 'get_ground_projection_root', 'check_and_pad_id', 'PathManager', 'DBManager', 'L1AWriter',
+           'read_L1A_dataset', 'read_L1A_settings', 'read_L1A_fingerprints']
 
 # %% ../../notebooks/05a_production.io.ipynb 3
 LOGGER = logging.getLogger(__name__)
@@ -214,6 +218,20 @@ class PathManager:
 
         return self.fanfile.parent / "clustering_settings.yaml"
 
+    @property
+    def run_settings_file(self):
+        """
+        Returns the path to the clustering settings YAML file of a whole run,
+        at obsid level, with the settings shared by all tiles and the
+        min_samples of each tile.
+        Returns
+        -------
+        pathlib.Path
+            The path to the obsid's "clustering_settings.yaml" file.
+        """
+
+        return self.path_so_far / "clustering_settings.yaml"
+
     @property
     def obsid(self):
         if self._obsid == "":
@@ -265,6 +283,16 @@ class PathManager:
         "Subfolder name for the clustered data before fnotching."
         return "L1A"
 
+    @property
+    def L1A_dataset(self):
+        "Folder of the obsid-wide L1A Parquet dataset, see `L1AWriter`."
+        return self.path_so_far / f"{self.L1A_folder}.parquet"
+
+    @property
+    def L1A_fingerprint_file(self):
+        "File with the fingerprint of the clustering inputs of the L1A CSV files."
+        return self.get_path("fingerprint", self.L1A_folder).with_suffix(".txt")
+
     @property
     def L1B_folder(self):
         "Subfolder name for the fnotched data, before cut is applied."
@@ -395,8 +423,6 @@ class PathManager:
         # the fnotchfile has an index, so i need to read that here:
         return pd.read_csv(self.fnotchfile, index_col=0)
 
-
-
 # %% ../../notebooks/05a_production.io.ipynb 7
 class DBManager:
 
@@ -564,3 +590,214 @@ class DBManager:
     def get_general_filter(self, f):
         return self.read(where=f)
 
+
+# %% ../../notebooks/05a_production.io.ipynb 8
+L1A_SETTINGS_KEY = b"p4tools.clustering_settings"
+L1A_FINGERPRINTS_KEY = b"p4tools.tile_fingerprints"
+
+
+class L1AWriter:
+
+    """Collect the clustering results of many tiles into one Parquet dataset per obsid.
+
+    Instead of two CSV files and a settings file per image_id, the results of all tiles
+    are appended to a dataset partitioned by marking kind (`kind=fan/`, `kind=blotch/`).
+    The clustering settings are stored once, as metadata of the dataset, together with
+    the fingerprints of the tiles' clustering inputs. Results are buffered and written
+    in batches of `batch_size` tiles.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Dataset folder, usually `PathManager.L1A_dataset`.
+    settings : dict, optional
+        Clustering settings to store as dataset metadata.
+    batch_size : int, optional
+        Number of tiles to buffer before writing a part file. Default: 500
+    overwrite : bool, optional
+        If True, an existing dataset at `path` is removed first. Otherwise new part
+        files are added to it, and the existing rows of the tiles written again are
+        removed from the old part files. This scans all old part files on every
+        `flush`, so replace many tiles with one writer rather than one writer per
+        tile. Default: True
+    keep_previous : bool, optional
+        If True, the rows and fingerprints of an existing dataset are kept in memory
+        before it is overwritten, so that unchanged tiles can be carried over with
+        `carry_over`. Default: False
+    """
+
+    def __init__(self, path, settings=None, batch_size=500, overwrite=True, keep_previous=False):
+        self.path = Path(path)
+        self.settings = settings
+        self.batch_size = batch_size
+        self.previous_fingerprints = {}
+        self._previous = {}
+        if keep_previous and self.path.exists():
+            self.previous_fingerprints = read_L1A_fingerprints(self.path)
+            for kind in ["fan", "blotch"]:
+                previous = read_L1A_dataset(self.path, kind)
+                if len(previous) > 0:
+                    self._previous[kind] = dict(list(previous.groupby("image_id", sort=False)))
+        self.fingerprints = {} if overwrite else read_L1A_fingerprints(self.path)
+        self._previous_settings = None if overwrite else read_L1A_settings(self.path)
+        if overwrite and self.path.exists():
+            shutil.rmtree(self.path)
+        # part files written before, whose rows of re-written tiles have to be dropped
+        self._old_parts = sorted(self.path.glob("kind=*/*.parquet"))
+        self.n_parts = 1 + max((int(p.stem.split("-")[-1]) for p in self._old_parts), default=-1)
+        self._buffer = {"fan": [], "blotch": []}
+        self._buffered_ids = set()
+        self._n_buffered = 0
+
+    def append(self, image_id, obsid, reduced_data, min_samples=None, fingerprint=None):
+        """Buffer the results of one tile.
+
+        Parameters
+        ----------
+        image_id, obsid : str
+            Planet Four image_id and HiRISE obsid of the tile.
+        reduced_data : dict
+            `DBScanner.reduced_data`: averaged clusters per kind, or an empty list.
+        min_samples : int, optional
+            DBSCAN min_samples used for the tile, stored as column.
+        fingerprint : str, optional
+            Fingerprint of the tile's clustering inputs, stored in the dataset metadata.
+        """
+        if fingerprint is not None:
+            self.fingerprints[image_id] = fingerprint
+        self._buffered_ids.add(image_id)
+        for kind, df in reduced_data.items():
+            if not isinstance(df, pd.DataFrame) or len(df) == 0:
+                continue
+            df = df.assign(n_votes=df["n_votes"].astype("int"), image_id=image_id, image_name=obsid)
+            if min_samples is not None:
+                df["min_samples"] = min_samples
+            self._buffer[kind].append(df)
+        self._n_buffered += 1
+        if self._n_buffered >= self.batch_size:
+            self.flush()
+
+    def carry_over(self, image_id):
+        "Buffer the previous rows and fingerprint of the unchanged tile `image_id`."
+        if image_id in self.previous_fingerprints:
+            self.fingerprints[image_id] = self.previous_fingerprints[image_id]
+        self._buffered_ids.add(image_id)
+        for kind, previous in self._previous.items():
+            if image_id in previous:
+                self._buffer[kind].append(previous[image_id])
+        self._n_buffered += 1
+        if self._n_buffered >= self.batch_size:
+            self.flush()
+
+    def _drop_old_rows(self, image_ids):
+        "Remove the rows of `image_ids` from the part files that existed before."
+        image_ids = pa.array(list(image_ids), pa.string())
+        for partpath in list(self._old_parts):
+            # only the parts holding one of the tiles are read completely and rewritten
+            stored = pq.read_table(partpath, columns=["image_id"])["image_id"]
+            if not pc.any(pc.is_in(stored, image_ids)).as_py():
+                continue
+            table = pq.read_table(partpath)
+            table = table.filter(pc.invert(pc.is_in(table["image_id"], image_ids)))
+            if table.num_rows == 0:
+                partpath.unlink()
+                self._old_parts.remove(partpath)
+            else:
+                pq.write_table(table, partpath)
+            LOGGER.debug("Replaced old rows of re-written tiles in %s", partpath)
+
+    def flush(self):
+        "Write all buffered results into one new part file per kind."
+        if self._old_parts and self._buffered_ids:
+            self._drop_old_rows(self._buffered_ids)
+        self._buffered_ids = set()
+        for kind, frames in self._buffer.items():
+            if not frames:
+                continue
+            df = pd.concat(frames, ignore_index=True, sort=True)
+            partpath = self.path / f"kind={kind}" / f"part-{self.n_parts:05d}.parquet"
+            partpath.parent.mkdir(parents=True, exist_ok=True)
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), partpath)
+            LOGGER.debug("Wrote %i %s clusters to %s", len(df), kind, partpath)
+            self.n_parts += 1
+        self._buffer = {kind: [] for kind in self._buffer}
+        self._n_buffered = 0
+
+    def close(self):
+        "Write remaining results and the settings and fingerprint metadata."
+        self.flush()
+        metadata = {}
+        settings = self.settings
+        if settings is not None and self._old_parts:
+            # other tiles of the dataset keep the rows of an earlier run
+            if json.loads(json.dumps(settings)) != self._previous_settings:
+                LOGGER.warning(
+                    "Clustering settings differ from those of other tiles in %s, not storing "
+                    "them. Re-run the clustering of the whole obsid to get consistent results.",
+                    self.path,
+                )
+                settings = None
+        if settings is not None:
+            metadata[L1A_SETTINGS_KEY] = json.dumps(settings)
+        if self.fingerprints:
+            metadata[L1A_FINGERPRINTS_KEY] = json.dumps(self.fingerprints)
+        metapath = self.path / "_common_metadata"
+        # also replace outdated metadata of an existing dataset
+        if metadata or metapath.exists():
+            self.path.mkdir(parents=True, exist_ok=True)
+            pq.write_metadata(pa.schema([], metadata=metadata), metapath)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_L1A_dataset(path, kind=None) -> pd.DataFrame:
+    """Read an L1A dataset written by `L1AWriter` in one go.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Dataset folder, usually `PathManager.L1A_dataset`.
+    kind : {'fan', 'blotch'}, optional
+        Marking kind to read. Default: both, with a `kind` column added.
+
+    Returns
+    -------
+    pd.DataFrame
+        Clustered markings of all tiles.
+    """
+    path = Path(path)
+    kinds = ["fan", "blotch"] if kind is None else [kind]
+    frames = []
+    for k in kinds:
+        if not (path / f"kind={k}").is_dir():
+            continue
+        # all part files of a kind in one read
+        df = pd.read_parquet(path / f"kind={k}")
+        frames.append(df if kind is not None else df.assign(kind=k))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True, sort=False)
+
+
+def read_L1A_settings(path) -> dict | None:
+    "Return the clustering settings stored with the L1A dataset at `path`."
+    metapath = Path(path) / "_common_metadata"
+    if not metapath.exists():
+        return None
+    metadata = pq.read_schema(metapath).metadata or {}
+    if L1A_SETTINGS_KEY not in metadata:
+        return None
+    return json.loads(metadata[L1A_SETTINGS_KEY])
+
+
+def read_L1A_fingerprints(path) -> dict:
+    "Return the per-tile input fingerprints stored with the L1A dataset at `path`."
+    metapath = Path(path) / "_common_metadata"
+    if not metapath.exists():
+        return {}
+    metadata = pq.read_schema(metapath).metadata or {}
+    return json.loads(metadata.get(L1A_FINGERPRINTS_KEY, b"{}"))
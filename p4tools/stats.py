@@ -1,9 +1,11 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../notebooks/03_stats.ipynb.
 
 # %% auto 0
-__all__ = ['mars_years', 'define_martian_year']
+__all__ = ['mars_years', 'MARS_YEAR_DAYS', 'martian_year', 'martian_year_fraction', 'l_s_bins', 'define_martian_year',
+           'define_time_columns']
 
 # %% ../notebooks/03_stats.ipynb 1
+import numpy as np
 import pandas as pd
 
 
@@ -23,21 +25,140 @@ mars_years = {
     40: "2028-08-17",
 }
 
+# mean length of a Mars year in Earth days, for times after the last entry of `mars_years`
+MARS_YEAR_DAYS = 686.97
+
 # %% ../notebooks/03_stats.ipynb 2
-def define_martian_year(df, time_col_name):
-    """This Function Modifies the Dataframe it is given. And adds a Column named "MY",
-        which signifies the Mars Year a Datapoint was taken.
+_MY_NUMBERS = np.array(list(mars_years))
+_MY_STARTS = pd.to_datetime(list(mars_years.values())).to_numpy(dtype="datetime64[ns]")
+_MY_LENGTHS = np.diff(
+    np.append(_MY_STARTS, _MY_STARTS[-1] + np.timedelta64(int(MARS_YEAR_DAYS * 86400), "s"))
+)
+
+
+def _to_datetime64(times):
+    return pd.to_datetime(pd.Series(times)).to_numpy(dtype="datetime64[ns]")
+
+
+def _like(times, values, name):
+    "Return `values` as Series on the index of `times` if that is a Series."
+    if isinstance(times, pd.Series):
+        return pd.Series(values, index=times.index, name=name)
+    return values
+
+
+def _year_positions(values):
+    """Index into `mars_years` of the year each time falls into, -1 before MY 28 or for NaT.
+
+    A time exactly on a year start still belongs to the previous year, as a year only
+    counts for times after its start date. `martian_year_fraction` gives the full
+    number of the new year there.
+    """
+    pos = np.searchsorted(_MY_STARTS, values, side="left") - 1
+    pos[np.isnat(values)] = -1
+    return pos
+
+
+def martian_year(times):
+    """Return the Mars Year for each of `times`, 0 for times before MY 28.
+
+    Parameters
+    ----------
+    times : array-like or pandas.Series
+        Dates, or anything `pandas.to_datetime` understands.
+
+    Returns
+    -------
+    np.array or pandas.Series
+        Integer Mars Years, as Series named 'MY' if `times` was a Series.
+    """
+    pos = _year_positions(_to_datetime64(times))
+    years = np.where(pos >= 0, _MY_NUMBERS[pos.clip(0)], 0)
+    return _like(times, years, "MY")
+
+
+def martian_year_fraction(times):
+    """Return fractional Mars Years, e.g. 34.5 for the middle of MY 34.
+
+    Times after the start of the last year in `mars_years` are extrapolated
+    with `MARS_YEAR_DAYS`. Times before MY 28 become NaN.
+    """
+    values = _to_datetime64(times)
+    pos = _year_positions(values)
+    clipped = pos.clip(0)
+    fraction = (values - _MY_STARTS[clipped]) / _MY_LENGTHS[clipped]
+    out = np.where(pos >= 0, _MY_NUMBERS[clipped] + fraction, np.nan)
+    return _like(times, out, "MY_fraction")
+
+
+def l_s_bins(l_s, binsize=10):
+    "Return the lower edge of the `binsize` wide L_s bin for each of `l_s`."
+    out = np.floor(np.asarray(l_s, dtype="float") / binsize) * binsize
+    return _like(l_s, out, "l_s_bin")
+
+
+def define_martian_year(df, time_col_name, inplace=False):
+    """Calculate the Mars Year a Datapoint was taken, optionally as column "MY" of `df`.
+
+    The years are assigned in one pass over the dates.
 
     Parameters
     ----------
     df : pandas.DataFrame
         A Dataframe for which we wish to calculate the Mars Years
     time_col_name : str
-        The Name of the column which has the Dates 
+        The Name of the column which has the Dates
         which to correspond to Mars Years.
+    inplace : bool, optional
+        If True, also add the result as column "MY" to `df`. Default: False
+
+    Returns
+    -------
+    pandas.Series
+        The Mars Year per row, 0 for dates until the start of MY 28.
     """
-    mars_timestamps = {k: pd.to_datetime(v) for k, v in mars_years.items()}
-    df["MY"] = 0
-    for yr, t in mars_timestamps.items():
-        df.loc[df[time_col_name] > t, "MY"] = yr
+    my = martian_year(df[time_col_name])
+    if inplace:
+        df["MY"] = my
+    return my
 
+
+def define_time_columns(df, time_col_name, l_s_col_name=None, ls_binsize=10, inplace=False):
+    """Calculate Mars Year, fractional Mars Year and optionally L_s bins in one go.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Data with a date column and optionally a solar longitude column.
+    time_col_name : str
+        Name of the date column.
+    l_s_col_name : str, optional
+        Name of the solar longitude column. If given, an 'l_s_bin' column is added.
+    ls_binsize : float, optional
+        Width of the L_s bins in degrees.
+    inplace : bool, optional
+        If True, also add the new columns to `df`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns 'MY', 'MY_fraction' and, if requested, 'l_s_bin' on the index of `df`.
+    """
+    values = _to_datetime64(df[time_col_name])
+    pos = _year_positions(values)
+    clipped = pos.clip(0)
+    valid = pos >= 0
+    fraction = (values - _MY_STARTS[clipped]) / _MY_LENGTHS[clipped]
+    out = pd.DataFrame(
+        {
+            "MY": np.where(valid, _MY_NUMBERS[clipped], 0),
+            "MY_fraction": np.where(valid, _MY_NUMBERS[clipped] + fraction, np.nan),
+        },
+        index=df.index,
+    )
+    if l_s_col_name is not None:
+        out["l_s_bin"] = l_s_bins(df[l_s_col_name].to_numpy(), ls_binsize)
+    if inplace:
+        for col in out.columns:
+            df[col] = out[col]
+    return out